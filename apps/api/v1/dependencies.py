@@ -1 +1,23 @@
-# API 실행 시 주입할 내용
\ No newline at end of file
+# API 실행 시 주입할 내용
+from typing import TYPE_CHECKING, Annotated, AsyncIterator
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from ...config import Setting
+
+# 요청마다 AsyncSession 하나를 열고 응답 후 닫음
+# session_factory는 create_app의 lifespan에서 app.state에 등록
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    async with request.app.state.session_factory() as session:
+        yield session
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+
+# create_app에서 app.state에 등록한 Setting, config를 직접 import하면 순환 참조가 생기므로 request에서 조회
+# 타입 힌트는 문자열로만 참조(TYPE_CHECKING), FastAPI는 Depends 파라미터의 타입을 평가하지 않음
+def get_app_settings(request: Request) -> "Setting":
+    return request.app.state.settings
+
+SettingsDep = Annotated["Setting", Depends(get_app_settings)]
@@ -1,23 +1,43 @@
 from fastapi import (
-    APIRouter, Request, Path, Query, Body, Cookie, Header, Form
+    APIRouter, Request, Path, Query, Body, Cookie, Header, Form, HTTPException, Depends
 )
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import (
-    PlainTextResponse, JSONResponse, HTMLResponse, ORJSONResponse
+    PlainTextResponse, JSONResponse, HTMLResponse, ORJSONResponse, Response
 )
-from fastapi.templating import Jinja2Templates
 import os
 from typing import (
-    Union, Annotated, Literal, List
+    Any, Dict, Union, Annotated, Literal, List
 )
-from pydantic import BaseModel, Field
-from ...service.test_json_orjson import test_data, test_data_v2
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, WrapValidator, model_validator
+from ...core.response_model import trusted_response
+from ...core.routing import FastJSONRoute
+from ...core.templating import TemplateRenderer
+from ...service.batch import run_grouped
+from ...service.cache import cached_dependency
+from ...service.columnar import Bucket, ColumnarUsers, columnar_users
+from ...service.items import ITEM_TABLES, delete_item, item_cache, save_item
+from ...service.pagination import decode_cursor, encode_cursor, keyset_indexes
+from ...service.test_json_orjson import get_test_data, get_test_data_v2, peek_test_data
+from ...service.user_query import UserQuery, user_query_engines
+from ...service import synthetic, test_json_orjson
+from ...service.response_cache import ENCODERS, cached_response, response_cache
+from ...service.shared_dataset import source_version
+from ...service.synthetic import estimate_payload_size, get_synthetic_payload
+from ...service.snapshot import Snapshot
+from ...service.streaming import StreamFormat, stream_snapshot
+from .dependencies import SettingsDep
 
 TEMPLATES_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates')
-templates: Jinja2Templates = Jinja2Templates(directory=TEMPLATES_DIR)
+STATIC_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static')
+# create_app에서 Setting 값으로 configure, 라우트 등록 후 bind(app)
+templates: TemplateRenderer = TemplateRenderer(directory=TEMPLATES_DIR, static_dir=STATIC_DIR)
 
 api_router_l_fastapi: APIRouter = APIRouter(
     prefix='/l_fastapi', 
     tags=['fastapi'],
+    route_class=FastJSONRoute,
 )
 
 @api_router_l_fastapi.get(
@@ -27,12 +47,34 @@ api_router_l_fastapi: APIRouter = APIRouter(
 async def test_plaintext():
     return 'hello test'
 
+# /json, /orjson 직렬화 결과는 워커 간 공유 스냅샷 파일로 한 벌만 생성(service.shared_dataset, service.snapshot)
+# 파일을 만드는 워커도 데이터셋을 계속 들고 있지 않도록 캐시되지 않는 build 함수 사용(get_test_data_v2와 같은 데이터)
+# 데이터셋 생성 코드(seed 포함) 버전, 코드가 바뀌면 공유 파일/컬럼 표현을 새로 만듦
+TEST_DATA_VERSION: str = source_version(test_json_orjson, synthetic)
+response_cache.share('test_data_v2', test_json_orjson.build_test_data_v2, TEST_DATA_VERSION)
+
+# 공유 키의 스냅샷(service.snapshot), 이미 연 스냅샷이 없을 때만 스레드 풀에서 열기/생성
+# get_test_data_v2()(메모이즈된 dict 데이터셋)를 쓰지 않으므로 스트리밍/단건 조회도 워커에 데이터셋을 남기지 않음
+async def dataset_snapshot(key: str, encoder: str) -> Snapshot:
+    snapshot = response_cache.get_snapshot(key, encoder)
+    if snapshot is None:
+        snapshot = await run_in_threadpool(response_cache.snapshot, key, encoder)
+    return snapshot
+
 @api_router_l_fastapi.get(
     '/json',
     response_class=JSONResponse,
 )
-async def test_json():
-    return JSONResponse(status_code=200, content=test_data_v2)
+# 직렬화 결과를 캐시, 데이터가 바뀌면 response_cache.invalidate('test_data_v2') 호출
+# ?stream=1 이면 캐시된 응답 대신 스냅샷을 청크/원소(사용자) 단위로 나눠서 전송(전송 방식 비교용, 직렬화는 스냅샷 생성 시 한 번)
+@cached_response('test_data_v2', encoder='json', bypass=lambda params: params['stream'])
+async def test_json(
+    stream: bool = False,
+    stream_format: StreamFormat = Query('array', alias='format'),
+):
+    if stream:
+        return stream_snapshot(await dataset_snapshot('test_data_v2', 'json'), stream_format)
+    return get_test_data_v2()
 
 @api_router_l_fastapi.get(
     '/html',
@@ -57,18 +99,53 @@ async def test_html():
     '/jinja2/{id}',
     response_class=HTMLResponse,
 )
-# request 필수
-async def test_jinja2(request: Request, id: str):
-    return templates.TemplateResponse(
-        request=request, name='item.html', context={"id": id}
-    )
+# 결과가 id로만 정해지므로 렌더 결과를 캐시, ?stream=true 면 렌더링되는 대로 전송(큰 템플릿용)
+async def test_jinja2(id: str, stream: bool = False):
+    if stream:
+        return templates.stream('item.html', {"id": id})
+    return await templates.response('item.html', {"id": id}, cache=True)
 
 @api_router_l_fastapi.get(
     '/orjson',
     response_class=ORJSONResponse,
 )
-async def test_orjson():
-    return ORJSONResponse(status_code=200, content=test_data_v2)
+@cached_response('test_data_v2', encoder='orjson', bypass=lambda params: params['stream'])
+async def test_orjson(
+    stream: bool = False,
+    stream_format: StreamFormat = Query('array', alias='format'),
+):
+    if stream:
+        return stream_snapshot(await dataset_snapshot('test_data_v2', 'orjson'), stream_format)
+    return get_test_data_v2()
+
+# 사용자 한 명의 JSON, /orjson과 같은 스냅샷 파일(service.snapshot)의 인덱스로 위치를 찾아 slice 그대로 전송
+# 데이터셋 dict를 만들거나 직렬화하지 않음, 스냅샷이 없을 때만 스레드 풀에서 열기/생성
+@api_router_l_fastapi.get('/orjson/users/{user_id}')
+async def test_orjson_user(user_id: int):
+    body = (await dataset_snapshot('test_data_v2', 'orjson')).item(user_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return Response(content=body, media_type='application/json')
+
+# 부하 테스트용 합성 페이로드, 크기/형태를 바꿔가며 직렬화 처리량 곡선을 측정
+# 매 요청마다 직렬화하도록 캐시하지 않음, 생성 결과만 메모이즈
+# 생성/직렬화가 CPU 작업이므로 def로 선언해서 스레드 풀에서 실행
+MAX_SYNTHETIC_BYTES: int = 256 * 1024 * 1024
+
+@api_router_l_fastapi.get('/synthetic')
+def test_synthetic(
+    users: int = Query(1000, ge=0, le=100_000),
+    depth: int = Query(1, ge=0, le=8),
+    string_length: int = Query(100, ge=0, le=10_000),
+    fields: int = Query(8, ge=1, le=64),
+    numeric_ratio: float = Query(0.5, ge=0, le=1),
+    seed: int = 0,
+    encoder: Literal['json', 'orjson'] = 'orjson',
+):
+    if estimate_payload_size(users, depth, string_length, fields, numeric_ratio) > MAX_SYNTHETIC_BYTES:
+        raise HTTPException(status_code=422, detail=f"payload would exceed {MAX_SYNTHETIC_BYTES} bytes")
+    payload = get_synthetic_payload(users, depth, string_length, fields, numeric_ratio, seed)
+    return Response(content=ENCODERS[encoder](payload), media_type='application/json')
 
 # 경로파라미터 테스트, 경로 파라미터는 값이 필수로 입력됨. ...으로 표시해두면 좋음
 # Query 함수에서 alias 인자는 요청을 보낼 때 쿼리파라미터 변수명을 다른 이름으로 사용할 수 있도록
@@ -90,7 +167,7 @@ async def test_query_parameter(
         min_length=3,
         max_length=50,
     ), 
-):
+) -> Dict[str, Any]:
     results: dict = {"items": [{"item_id": "Foo"}, {"item_id": "Bar"}]}
     if q:
         results.update({'q': q})
@@ -99,7 +176,7 @@ async def test_query_parameter(
 # *(Asterisk)를 사용하면 Query 함수를 사용해서 쿼리 인자를 정의하지 않아도 쿼리 파라미터로 인식
 # 이러한 표현식도 있다 정도 아는 것, 명시적인게 더 좋지 않나?
 @api_router_l_fastapi.get("/pathp1/{item_id}")
-async def test_path_query_parameter(*, item_id: int = Path(title="The ID of the item to get"), q: str):
+async def test_path_query_parameter(*, item_id: int = Path(title="The ID of the item to get"), q: str) -> Dict[str, Any]:
     results = {"item_id": item_id}
     if q:
         results.update({"q": q})
@@ -112,7 +189,7 @@ async def test_path_parameter_check_num(
     *,
     item_id: int = Path(title="The ID of the item to get", gt=0, le=1000), # <-- 0보다 크거나 1000보다 작거나
     q: str,
-):
+) -> Dict[str, Any]:
     results = {"item_id": item_id}
     if q:
         results.update({"q": q})
@@ -125,7 +202,7 @@ async def test_path_parameter_check_float(
     item_id: int = Path(title="The ID of the item to get", ge=0, le=1000),
     q: str,
     size: float = Query(gt=0, lt=10.5),
-):
+) -> Dict[str, Any]:
     results = {"item_id": item_id}
     if q:
         results.update({"q": q})
@@ -136,7 +213,7 @@ async def test_path_parameter_check_float(
 # Pydantic model을 활용하여 쿼리 파라미터를 표현
 # FastAPI 0.115.0 부터 제공
 
-class FilterParams(BaseModel):
+class PageParams(BaseModel):
     # 쿼리 파라미터로 요청할 때 추가적인 데이터 포함을 금지하는 설정
     # 사용은 선택적으로.
     model_config = {"extra": "forbid"}
@@ -144,18 +221,126 @@ class FilterParams(BaseModel):
     limit: int = Field(100, gt=0, le=100)
     offset: int = Field(0, ge=0)
     order_by: Literal["created_at", "updated_at"] = "created_at"
+    # 이전 응답의 next_cursor, 지정하면 offset 대신 keyset 방식으로 다음 페이지 조회
+    cursor: Union[str, None] = None
+
+    @model_validator(mode="after")
+    def check_cursor_offset(self):
+        if self.cursor is not None and self.offset:
+            raise ValueError("cursor and offset cannot be used together")
+        return self
+
+class FilterParams(PageParams):
     tags: list[str] = []
 
-@api_router_l_fastapi.get("/fquery/")
-async def test_filter_query(filter_query: Annotated[FilterParams, Query()]):
+# 검증이 끝난 모델을 그대로 반환하므로 반환 타입을 response_model로 써서 등록 시 만든 직렬화기로 인코딩
+# cursor는 /users 페이지 조회용 파라미터라 기존 응답 형태를 유지하도록 제외
+@api_router_l_fastapi.get("/fquery/", response_model_exclude={"cursor"})
+async def test_filter_query(filter_query: Annotated[FilterParams, Query()]) -> FilterParams:
     return filter_query
 
+# test_data(v1) 사용자 목록 페이지 조회, test_data_v2에는 created_at/updated_at이 없어서 v1 사용
+# 정렬 인덱스는 데이터셋/정렬 기준별로 한 번만 만들고, 이후 페이지는 cursor 위치부터 limit개만 잘라서 반환
+# 데이터셋 생성과 인덱스 생성은 블로킹이므로 처음 한 번만 스레드 풀에서 실행(get_columnar_users와 같은 방식)
+async def get_test_users() -> List[Dict[str, Any]]:
+    data = peek_test_data()
+    if data is None:
+        data = await run_in_threadpool(get_test_data)
+    return data["users"]
+
+@api_router_l_fastapi.get("/users")
+async def list_test_users(filter_query: Annotated[FilterParams, Query()]) -> Dict[str, Any]:
+    order_by = filter_query.order_by
+    users = await get_test_users()
+    index = keyset_indexes.peek(users, order_by)
+    if index is None:
+        index = await run_in_threadpool(keyset_indexes.get, users, order_by, lambda user: user["metadata"][order_by])
+    tags = set(filter_query.tags)
+    predicate = (lambda user: not tags.isdisjoint(user["metadata"]["tags"])) if tags else None
+    try:
+        after = decode_cursor(filter_query.cursor, order_by) if filter_query.cursor else None
+        page, last = index.page(filter_query.limit, after, filter_query.offset, predicate)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return {
+        "users": page,
+        "next_cursor": encode_cursor(order_by, *last) if last is not None else None,
+    }
+
+class UserQueryParams(FilterParams):
+    order_by: Literal["id", "name", "balance", "created_at", "updated_at"] = "id"
+    desc: bool = False
+    is_active: Union[bool, None] = None
+    language: Union[str, None] = None
+    theme: Union[str, None] = None
+    min_balance: Union[float, None] = None
+    max_balance: Union[float, None] = None
+    # 이 id를 친구로 가진 사용자
+    friend: Union[int, None] = None
+    # 반환할 최상위 필드, 비어 있으면 전체
+    fields: list[str] = []
+
+# test_data(v1) 사용자 조회, 데이터셋별로 한 번 만든 인덱스(service.user_query)로 필터/정렬하므로 요청마다 전체를 훑지 않음
+# tags는 하나라도 일치, 나머지 조건은 모두 만족(AND)
+@api_router_l_fastapi.get("/users/query")
+async def query_test_users(query: Annotated[UserQueryParams, Query()]) -> Dict[str, Any]:
+    users = await get_test_users()
+    engine = user_query_engines.peek(users)
+    if engine is None:
+        engine = await run_in_threadpool(user_query_engines.get, users)
+    try:
+        after = decode_cursor(query.cursor, query.order_by) if query.cursor else None
+        result = engine.query(UserQuery(**query.model_dump(exclude={"cursor"}), after=after))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return {
+        "users": result.users,
+        "total": result.total,
+        "next_cursor": encode_cursor(query.order_by, *result.last) if result.last is not None else None,
+    }
+
+# test_data(v1) 사용자 집계, 데이터셋 버전별로 한 번 만든 컬럼 표현(service.columnar)으로 계산
+# 컬럼은 캐시되지 않는 build 함수로 만든 일회성 데이터셋에서 생성하므로 dict 데이터셋을 워커에 남기지 않음
+async def get_columnar_users() -> ColumnarUsers:
+    key = ('test_data', TEST_DATA_VERSION)
+    store = columnar_users.peek(key)
+    if store is None:
+        store = await run_in_threadpool(columnar_users.get, key, lambda: test_json_orjson.build_test_data()["users"])
+    return store
+
+ColumnarDep = Annotated[ColumnarUsers, Depends(get_columnar_users)]
+
+@api_router_l_fastapi.get("/users/stats/balance")
+async def test_users_balance_stats(
+    store: ColumnarDep,
+    is_active: Union[bool, None] = None,
+    language: Union[str, None] = None,
+    percentiles: list[float] = Query([50, 90, 99]),
+) -> Dict[str, Any]:
+    if any(not 0 <= percent <= 100 for percent in percentiles):
+        raise HTTPException(status_code=422, detail="percentiles must be between 0 and 100")
+    try:
+        return store.balance_stats(percentiles, is_active=is_active, language=language)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@api_router_l_fastapi.get("/users/stats/languages")
+async def test_users_language_counts(store: ColumnarDep, is_active: Union[bool, None] = None) -> Dict[str, int]:
+    return store.language_counts(is_active)
+
+# 날짜 버킷(day, week(월요일 시작), month)별 거래 수/합계
+@api_router_l_fastapi.get("/users/stats/transactions")
+async def test_users_transaction_totals(store: ColumnarDep, bucket: Bucket = "month") -> List[Dict[str, Any]]:
+    return store.transaction_totals(bucket)
+
 class Item(BaseModel):
     name: str
     description: Union[str, None] = None
     price: float
     tax: Union[float, None] = None
 
+# 아래에서 Item을 다시 정의하므로 body 예제(test_body, test_body_embed)가 쓰는 모델을 batch에서 참조하기 위한 이름
+BodyItem = Item
 
 @api_router_l_fastapi.get("/pqparam/{item_id}")
 async def test_pqparam(
@@ -175,6 +360,13 @@ class User(BaseModel):
     username: str
     full_name: Union[str, None] = None
 
+# test_body 응답 모델, 값이 모두 검증된 body 모델이라 다시 검증하는 비용은 거의 없음
+class BodyResult(BaseModel):
+    item_id: int
+    item: BodyItem
+    user: User
+    importance: int
+
 """ FastAPI가 인지하는 body의 구조
 {
     "item": {
@@ -191,7 +383,7 @@ class User(BaseModel):
 }
 """
 @api_router_l_fastapi.put("/body/{item_id}")
-async def test_body(item_id: int, item: Item, user: User, importance: int = Body(gt=0)):
+async def test_body(item_id: int, item: Item, user: User, importance: int = Body(gt=0)) -> BodyResult:
     results = {"item_id": item_id, "item": item, "user": user, "importance": importance}
     return results
 
@@ -237,7 +429,7 @@ class CommonHeaders(BaseModel):
     x_tag: list[str] = []
 
 @api_router_l_fastapi.get("/header/")
-async def test_header(headers: Annotated[CommonHeaders, Header()]):
+async def test_header(headers: Annotated[CommonHeaders, Header()]) -> CommonHeaders:
     return headers
 
 class Item(BaseModel):
@@ -247,37 +439,154 @@ class Item(BaseModel):
     tax: float = 10.5
     tags: List[str] = []
 
-items_first = {
-    "foo": {"name": "Foo", "price": 50.2},
-    "bar": {"name": "Bar", "description": "The bartenders", "price": 62, "tax": 20.2},
-    "baz": {"name": "Baz", "description": None, "price": 50.2, "tax": 10.5, "tags": []},
-}
+# 아이템은 service.items 저장소에서 item_cache(read-through LRU/TTL)를 거쳐 조회
+items_first = ITEM_TABLES["first"]
+items_second = ITEM_TABLES["second"]
+
+FirstItemDep = Annotated[dict, Depends(cached_dependency(item_cache, "item_id", key=lambda item_id: ("first", item_id)))]
+SecondItemDep = Annotated[dict, Depends(cached_dependency(item_cache, "item_id", key=lambda item_id: ("second", item_id)))]
 
 @api_router_l_fastapi.get("/exc_unset/{item_id}", response_model=Item, response_model_exclude_unset=True)
-async def test_res_model_exclude_unset(item_id: str):
-    return items_first[item_id]
-
-items_second = {
-    "foo": {"name": "Foo", "price": 50.2},
-    "bar": {"name": "Bar", "description": "The Bar fighters", "price": 62, "tax": 20.2},
-    "baz": {
-        "name": "Baz",
-        "description": "There goes my baz",
-        "price": 50.2,
-        "tax": 10.5,
-    },
-}
+async def test_res_model_exclude_unset(item: FirstItemDep):
+    return item
 
+# 검증 생략(trusted_response): 아이템은 내부 저장소(service.items)의 값이고 쓰기는 put_item에서 Item으로 검증한 뒤 저장됨
+# 포함하는 필드(name, description)는 문자열/None이라 타입 변환 차이(int -> float 등)도 생기지 않음
 @api_router_l_fastapi.get(
     "/include/{item_id}/name",
     response_model=Item,
     response_model_include={"name", "description"},
 )
-async def test_response_model_include(item_id: str):
-    return items_second[item_id]
+@trusted_response
+async def test_response_model_include(item: SecondItemDep):
+    return item
 
 @api_router_l_fastapi.get("/exclude/{item_id}/public", response_model=Item, response_model_exclude={"tax"})
-async def test_response_model_exclude(item_id: str):
-    return items_second[item_id]
-
+async def test_response_model_exclude(item: SecondItemDep):
+    return item
+
+# 아이템 저장/삭제, 해당 키의 캐시를 무효화하므로 다음 조회부터 바뀐 값이 반환됨
+@api_router_l_fastapi.put("/items/{table}/{item_id}", response_model=Item, response_model_exclude_unset=True)
+async def put_item(table: Literal["first", "second"], item_id: str, item: Item):
+    return await save_item(table, item_id, item.model_dump(exclude_unset=True))
+
+@api_router_l_fastapi.delete("/items/{table}/{item_id}", status_code=204)
+async def remove_item(table: Literal["first", "second"], item_id: str):
+    try:
+        await delete_item(table, item_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+# 여러 작업을 한 번의 요청으로 처리하는 batch
+# 각 작업은 op 값으로 구분하고 기존 엔드포인트(test_body, test_body_embed)와 아이템 저장/삭제를 그대로 호출
+class BodyOperation(BaseModel):
+    op: Literal["body"]
+    item_id: int
+    item: BodyItem
+    user: User
+    importance: int = Field(gt=0)
+
+class BodyEmbedOperation(BaseModel):
+    op: Literal["bodyembed"]
+    item_id: int
+    item: BodyItem
+
+class PutItemOperation(BaseModel):
+    op: Literal["put_item"]
+    table: Literal["first", "second"]
+    item_id: str
+    item: Item
+
+class DeleteItemOperation(BaseModel):
+    op: Literal["delete_item"]
+    table: Literal["first", "second"]
+    item_id: str
+
+Operation = Annotated[
+    Union[BodyOperation, BodyEmbedOperation, PutItemOperation, DeleteItemOperation],
+    Field(discriminator="op"),
+]
+
+class BatchItemError(BaseModel):
+    # 검증에 실패한 작업, 나머지 작업은 계속 처리
+    errors: List[dict]
+
+def capture_item_errors(value, handler):
+    # 작업 하나의 검증 실패가 batch 전체 실패(422)가 되지 않도록 에러를 결과로 바꿈
+    try:
+        return handler(value)
+    except ValidationError as exc:
+        return BatchItemError(errors=exc.errors(include_url=False, include_context=False))
+
+MAX_BATCH_OPERATIONS: int = 5000
+
+# 요청 본문 전체를 한 번의 validate_json으로 파싱 + 검증(json.loads 후 필드별 검증을 따로 하지 않음)
+BatchAdapter = TypeAdapter(
+    Annotated[
+        List[Annotated[Operation, WrapValidator(capture_item_errors)]],
+        Field(max_length=MAX_BATCH_OPERATIONS),
+    ]
+)
 
+class BatchResult(BaseModel):
+    index: int
+    status: int
+    result: Any = None
+    errors: Union[List[dict], None] = None
+
+BatchResultsAdapter = TypeAdapter(List[BatchResult])
+
+def batch_key(operation):
+    # 같은 아이템을 건드리는 작업끼리는 순서대로 실행, 나머지는 독립적
+    if isinstance(operation, (PutItemOperation, DeleteItemOperation)):
+        return (operation.table, operation.item_id)
+    return None
+
+async def execute_operation(operation):
+    if isinstance(operation, BatchItemError):
+        return 422, None, operation.errors
+    try:
+        if isinstance(operation, BodyOperation):
+            result = await test_body(operation.item_id, operation.item, operation.user, operation.importance)
+        elif isinstance(operation, BodyEmbedOperation):
+            result = await test_body_embed(operation.item_id, operation.item)
+        elif isinstance(operation, PutItemOperation):
+            result = await save_item(operation.table, operation.item_id, operation.item.model_dump(exclude_unset=True))
+        else:
+            await delete_item(operation.table, operation.item_id)
+            result = None
+    except KeyError:
+        return 404, None, [{"msg": "Not found"}]
+    except HTTPException as exc:
+        return exc.status_code, None, [{"msg": exc.detail}]
+    return 200, result, None
+
+@api_router_l_fastapi.post(
+    "/batch",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": TypeAdapter(List[Operation]).json_schema()}},
+        }
+    },
+)
+async def test_batch(request: Request, settings: SettingsDep):
+    try:
+        operations = BatchAdapter.validate_json(await request.body())
+    except ValidationError as exc:
+        # JSON 형식 오류, 리스트가 아님, 작업 수 초과 등 batch 전체에 대한 오류
+        raise RequestValidationError(exc.errors(include_url=False, include_context=False))
+
+    async def run(indexed):
+        index, operation = indexed
+        status, result, errors = await execute_operation(operation)
+        return BatchResult(index=index, status=status, result=result, errors=errors)
+
+    results = await run_grouped(
+        list(enumerate(operations)),
+        lambda indexed: batch_key(indexed[1]),
+        run,
+        concurrency=settings.batch_concurrency,
+    )
+    return Response(content=BatchResultsAdapter.dump_json(results), media_type="application/json")
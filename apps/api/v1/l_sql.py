@@ -1,6 +1,217 @@
-from fastapi import APIRouter
+import time
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, Any, Literal, Union, List
+from ...core.routing import FastJSONRoute
+from ...db.models import Base
+from ...db.query_counter import query_budget
+from ...service import user_service
+from ...service.user_service import LoaderStrategy
+from ...service.pagination import decode_cursor, encode_cursor
+from ...service.test_json_orjson import build_test_data_v2
+from .dependencies import SessionDep, SettingsDep
+from .l_fastapi import PageParams
 
 api_router_l_sql: APIRouter = APIRouter(
     prefix='/l_sql',
     tags=['sql', 'db', 'sqlite', 'sqlalchemy'],
-)
\ No newline at end of file
+    route_class=FastJSONRoute,
+)
+
+# 요청/응답 스키마, from_attributes=True로 ORM 객체에서 바로 변환
+class AddressCreate(BaseModel):
+    email_address: str
+
+class AddressRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email_address: str
+
+class UserCreate(BaseModel):
+    # user_account.name 컬럼 길이(String(30))와 맞춤
+    name: str = Field(max_length=30)
+    fullname: Union[str, None] = None
+    addresses: List[AddressCreate] = []
+
+class UserUpdate(BaseModel):
+    # 생략하면 변경하지 않음(update_user는 exclude_unset으로 보낸 필드만 반영)
+    name: Union[str, None] = Field(default=None, max_length=30)
+    fullname: Union[str, None] = None
+
+    @field_validator("name")
+    @classmethod
+    def reject_null_name(cls, value: Union[str, None]) -> str:
+        # 기본값(생략)은 검증하지 않으므로 여기로 오는 None은 명시적 null, name 컬럼은 NULL 불가
+        if value is None:
+            raise ValueError("name cannot be null")
+        return value
+
+class UserRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    fullname: Union[str, None] = None
+    # loader=raise로 조회해서 로딩하지 않은 경우 null
+    addresses: Union[List[AddressRead], None] = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded(cls, data: Any) -> Any:
+        # 로딩하지 않은 관계(raise_on_sql/raiseload)는 getattr 시 예외가 나므로 로딩된 속성만 전달
+        if isinstance(data, Base):
+            unloaded = inspect(data).unloaded
+            return {
+                name: getattr(data, name) if name not in unloaded else None
+                for name in cls.model_fields
+            }
+        return data
+
+async def get_user_or_404(session, user_id: int, loader: LoaderStrategy = "selectin"):
+    user = await user_service.get_user(session, user_id, loader)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@api_router_l_sql.post('/users', response_model=UserRead, status_code=201)
+async def create_user(session: SessionDep, body: UserCreate):
+    return await user_service.create_user(
+        session, body.name, body.fullname, [a.email_address for a in body.addresses]
+    )
+
+# 기존 응답 형태(List[UserRead])를 유지하기 위해 다음 페이지 cursor는 X-Next-Cursor 헤더로 전달
+class UserPageParams(PageParams):
+    order_by: Literal["id", "created_at", "updated_at"] = "id"
+    loader: LoaderStrategy = "selectin"
+
+# 라우트별 최대 쿼리 수, selectin(2) 기준이며 사용자 수와 무관해야 함(N+1이면 초과)
+# page.loader로 요청마다 로딩 방식을 선택할 수 있음
+@api_router_l_sql.get(
+    '/users',
+    response_model=List[UserRead],
+    dependencies=[Depends(query_budget(2))],
+)
+async def list_users(
+    session: SessionDep,
+    response: Response,
+    page: Annotated[UserPageParams, Query()],
+):
+    after = None
+    if page.cursor is not None:
+        try:
+            value, last_id = decode_cursor(page.cursor, page.order_by)
+            after = (datetime.fromisoformat(value) if page.order_by != "id" else None, last_id)
+        except (ValueError, TypeError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+    users = await user_service.list_users(
+        session, page.limit, page.offset, page.order_by, after, page.loader
+    )
+    if len(users) == page.limit:
+        last = users[-1]
+        value = getattr(last, page.order_by)
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            page.order_by, value.isoformat() if page.order_by != "id" else None, last.id
+        )
+    return users
+
+class UserCount(BaseModel):
+    count: int
+
+# /users/{user_id}보다 먼저 등록해야 'count'가 user_id로 매칭되지 않음
+@api_router_l_sql.get(
+    '/users/count',
+    response_model=UserCount,
+    dependencies=[Depends(query_budget(1))],
+)
+async def count_users(session: SessionDep):
+    return UserCount(count=await user_service.count_users(session))
+
+@api_router_l_sql.get(
+    '/users/{user_id}',
+    response_model=UserRead,
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_user(session: SessionDep, user_id: int, loader: LoaderStrategy = "selectin"):
+    return await get_user_or_404(session, user_id, loader)
+
+# 전달된 필드만 수정(exclude_unset)
+@api_router_l_sql.patch('/users/{user_id}', response_model=UserRead)
+async def update_user(session: SessionDep, user_id: int, body: UserUpdate):
+    user = await get_user_or_404(session, user_id)
+    return await user_service.update_user(session, user, body.model_dump(exclude_unset=True))
+
+@api_router_l_sql.delete('/users/{user_id}', status_code=204)
+async def delete_user(session: SessionDep, user_id: int):
+    user = await get_user_or_404(session, user_id)
+    await user_service.delete_user(session, user)
+
+@api_router_l_sql.post('/users/{user_id}/addresses', response_model=AddressRead, status_code=201)
+async def add_address(session: SessionDep, user_id: int, body: AddressCreate):
+    user = await get_user_or_404(session, user_id)
+    return await user_service.add_address(session, user, body.email_address)
+
+@api_router_l_sql.get(
+    '/users/{user_id}/addresses',
+    response_model=List[AddressRead],
+    dependencies=[Depends(query_budget(2))],
+)
+async def list_addresses(session: SessionDep, user_id: int):
+    await get_user_or_404(session, user_id, "raise")
+    return await user_service.list_addresses(session, user_id)
+
+# 대량 입력용 스키마, upsert 시 기존 사용자를 찾을 수 있도록 id를 지정할 수 있음
+class UserBulkItem(UserCreate):
+    id: Union[int, None] = None
+
+class BulkResult(BaseModel):
+    users: int
+    addresses: int
+    chunks: int
+    elapsed_ms: float
+
+async def run_bulk_upsert(session, users: list, chunk_size: Union[int, None], upsert: bool, settings) -> BulkResult:
+    start = time.perf_counter()
+    try:
+        counts = await user_service.bulk_upsert_users(
+            session, users, chunk_size or settings.bulk_chunk_size, upsert=upsert
+        )
+    except IntegrityError:
+        # upsert=False에서 이미 있는 id를 넣은 경우, 트랜잭션 전체가 롤백됨
+        raise HTTPException(status_code=409, detail="User id already exists")
+    return BulkResult(**counts, elapsed_ms=(time.perf_counter() - start) * 1000)
+
+# 요청 본문 전체(List[UserBulkItem])를 한 번에 검증한 뒤 하나의 트랜잭션에서 chunk 단위로 입력
+@api_router_l_sql.post('/users/bulk', response_model=BulkResult, status_code=201)
+async def bulk_create_users(
+    session: SessionDep,
+    settings: SettingsDep,
+    body: List[UserBulkItem],
+    chunk_size: Union[int, None] = Query(default=None, gt=0, le=5000),
+    upsert: bool = False,
+):
+    users = [
+        {
+            "id": item.id,
+            "name": item.name,
+            "fullname": item.fullname,
+            "addresses": [a.email_address for a in item.addresses],
+        }
+        for item in body
+    ]
+    return await run_bulk_upsert(session, users, chunk_size, upsert, settings)
+
+# test_data_v2(1800명)를 DB에 적재, 같은 id로 다시 호출하면 갱신(upsert)
+@api_router_l_sql.post('/users/bulk/test-data', response_model=BulkResult, status_code=201)
+async def bulk_load_test_data(
+    session: SessionDep,
+    settings: SettingsDep,
+    chunk_size: Union[int, None] = Query(default=None, gt=0, le=5000),
+):
+    # 메모이즈된 데이터셋(get_test_data_v2) 대신 일회성으로 생성/변환, 변환 후 dict 데이터셋은 해제됨
+    users = await run_in_threadpool(lambda: user_service.users_from_dataset(build_test_data_v2()["users"]))
+    return await run_bulk_upsert(session, users, chunk_size, True, settings)
@@ -0,0 +1,146 @@
+# 벤치마크 공통 유틸: 반복 측정, 백분위 계산, 환경 정보, 결과 파일 저장/비교
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Awaitable, Callable, Dict, List
+
+RESULTS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'bench-results')
+
+PACKAGES = ("fastapi", "starlette", "pydantic", "orjson", "msgspec", "SQLAlchemy", "Jinja2")
+
+
+def summarize(samples: List[float], payload_bytes: int = 0) -> Dict[str, float]:
+    # samples: 초 단위 소요 시간, 결과는 ms 단위
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    total = sum(ordered)
+    summary = {
+        "iterations": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+    if payload_bytes:
+        summary["payload_bytes"] = payload_bytes
+        summary["mb_per_sec"] = payload_bytes * len(ordered) / total / (1024 * 1024) if total else 0.0
+    return summary
+
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int = 2) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 2) -> List[float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def traced_peak(fn: Callable[[], Any]) -> int:
+    # 한 번 실행하는 동안 파이썬 힙에서 추가로 잡힌 최대 바이트, 측정 반복과 분리해서 실행(tracemalloc 오버헤드)
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def traced_peak_async(fn: Callable[[], Awaitable[Any]]) -> int:
+    tracemalloc.start()
+    try:
+        await fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def peak_rss_bytes() -> int:
+    # 프로세스 전체의 최대 RSS, linux는 KB, macOS는 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            continue
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": packages,
+    }
+
+
+def write_results(name: str, results: List[Dict[str, Any]], output: str | None = None) -> str:
+    report = {"benchmark": name, "environment": environment(), "results": results}
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{report['environment']['commit']}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    return output
+
+
+def print_table(results: List[Dict[str, Any]], columns: List[str]) -> None:
+    header = ["case"] + columns
+    rows = [[r["case"]] + [_format(r.get(c)) for c in columns] for r in results]
+    widths = [max(len(str(v)) for v in col) for col in zip(header, *rows)]
+    for row in [header] + rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, metric: str = "p50_ms") -> None:
+    # 이전 커밋 결과 파일과 case 단위로 비교, 양수면 느려진 것
+    with open(baseline_path) as f:
+        baseline = {r["case"]: r for r in json.load(f)["results"]}
+    print(f"\n{metric} vs {baseline_path}")
+    for result in results:
+        before = baseline.get(result["case"], {}).get(metric)
+        after = result.get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {result['case']}: {before:.3f} -> {after:.3f} ({change:+.1f}%)")
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return "" if value is None else str(value)
@@ -0,0 +1,97 @@
+# 사용자 데이터셋 표현별 메모리/직렬화 벤치마크: dict(test_json_orjson) vs slots 레코드(service.records)
+# 메모리는 표현마다 새 프로세스(spawn)에서 데이터셋 하나만 만들고 RSS 증가량과 tracemalloc 기준 크기를 측정
+# (같은 프로세스에서 연달아 만들면 먼저 해제된 메모리를 재사용해서 RSS 차이가 드러나지 않음)
+# 직렬화는 orjson.dumps 시간, 두 표현의 JSON bytes가 같은지도 확인
+#
+# 사용 예시
+#   python -m apps.bench.records --iterations 30
+#   python -m apps.bench.records --compare bench-results/records-abc1234.json
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import orjson
+
+from ..service.records import build_test_records, build_test_records_v2
+from ..service.test_json_orjson import build_test_data, build_test_data_v2
+from .common import compare, measure, print_table, summarize, write_results
+
+BUILDERS: Dict[str, Dict[str, Callable[[], Dict[str, Any]]]] = {
+    "v1": {"dict": build_test_data, "records": build_test_records},
+    "v2": {"dict": build_test_data_v2, "records": build_test_records_v2},
+}
+
+
+def current_rss_bytes() -> int:
+    # 현재 RSS(/proc), 없으면(macOS 등) 최대 RSS로 대신함
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure_memory(dataset: str, representation: str, queue: Any) -> None:
+    # 자식 프로세스에서 실행, 데이터셋을 만든 채로 측정(워커가 데이터셋을 들고 있는 상태와 같음)
+    build = BUILDERS[dataset][representation]
+    gc.collect()
+    before = current_rss_bytes()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    after = current_rss_bytes()
+    queue.put({"users": len(data["users"]), "rss_bytes": after - before, "traced_bytes": traced})
+
+
+def measure_memory(dataset: str, representation: str) -> Dict[str, int]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure_memory, args=(dataset, representation, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def bench(iterations: int, skip_memory: bool) -> List[Dict[str, Any]]:
+    results = []
+    for dataset, builders in BUILDERS.items():
+        payloads = {representation: build() for representation, build in builders.items()}
+        encoded = {representation: orjson.dumps(payload) for representation, payload in payloads.items()}
+        if encoded["dict"] != encoded["records"]:
+            raise SystemExit(f"{dataset}: records encode to different JSON than the dict dataset")
+        for representation, payload in payloads.items():
+            result = {
+                "case": f"{dataset}:{representation}",
+                **summarize(measure(lambda: orjson.dumps(payload), iterations), len(encoded[representation])),
+            }
+            if not skip_memory:
+                result.update(measure_memory(dataset, representation))
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="dict vs slots record dataset memory/encode benchmark")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--skip-memory", action="store_true", help="skip the per-process RSS measurement")
+    parser.add_argument("--output", default=None, help="result json path (default: bench-results/records-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline result json to diff against")
+    args = parser.parse_args()
+
+    results = bench(args.iterations, args.skip_memory)
+    print_table(results, ["p50_ms", "p95_ms", "ops_per_sec", "rss_bytes", "traced_bytes"])
+    path = write_results("records", results, args.output)
+    print(f"\nresults written to {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
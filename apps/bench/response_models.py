@@ -0,0 +1,124 @@
+# response_model include/exclude/exclude_unset 직렬화 벤치마크
+# 1. 직렬화기만: FastAPI 기본 경로(serialize_response + render) vs 미리 만든 직렬화기(to_json) vs trusted(project + orjson)
+# 2. 라우트: l_fastapi.py의 exc_unset/include/exclude 라우트를 json_fast_path 끄고/켜고 ASGI로 호출
+#
+# 사용 예시
+#   python -m apps.bench.response_models --items 1,100,1000 --iterations 200
+#   python -m apps.bench.response_models --compare bench-results/response_models-abc1234.json
+import argparse
+import asyncio
+from typing import Any, Dict, List
+
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from ..api.v1.l_fastapi import Item
+from ..core.response_model import response_serializer
+from ..service.items import ITEM_TABLES
+from ..service.response_cache import encode_orjson
+from .common import compare, measure, measure_async, print_table, summarize, write_results
+
+# httpx는 ASGI transport 용도로만 필요, 앱 실행에는 필요 없으므로 requirements에 포함하지 않음
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# l_fastapi.py 라우트와 같은 조합
+CASES: Dict[str, Dict[str, Any]] = {
+    "exclude_unset": {"table": "first", "exclude_unset": True},
+    "include": {"table": "second", "include": {"name", "description"}},
+    "exclude": {"table": "second", "exclude": {"tax"}},
+}
+
+ROUTES = {
+    "exclude_unset": "/l_fastapi/exc_unset/{item_id}",
+    "include": "/l_fastapi/include/{item_id}/name",
+    "exclude": "/l_fastapi/exclude/{item_id}/public",
+}
+
+
+def bench_serializers(item_counts: List[int], iterations: int) -> List[Dict[str, Any]]:
+    results = []
+    for name, case in CASES.items():
+        options = {key: value for key, value in case.items() if key != "table"}
+        items = list(ITEM_TABLES[case["table"]].values())
+        for count in item_counts:
+            # 1개면 Item, 여러 개면 List[Item]
+            annotation = Item if count == 1 else List[Item]
+            content: Any = items[0] if count == 1 else [items[i % len(items)] for i in range(count)]
+            field = create_model_field(name="Response_bench", type_=annotation, mode="serialization")
+            serializer = response_serializer(annotation, **options)
+
+            def fastapi_default() -> bytes:
+                # serialize_response는 async 함수지만 is_coroutine=True면 내부에서 await하지 않으므로
+                # 이벤트 루프 없이 한 번 구동해서 결과를 꺼냄
+                coroutine = serialize_response(field=field, response_content=content, **options)
+                try:
+                    coroutine.send(None)
+                except StopIteration as stop:
+                    return ORJSONResponse(stop.value).body
+                raise RuntimeError("serialize_response awaited unexpectedly")
+
+            variants = {
+                "fastapi": fastapi_default,
+                "compiled": lambda: serializer.to_json(content),
+                "trusted": lambda: encode_orjson(serializer.project(content)),
+            }
+            for variant, fn in variants.items():
+                payload_bytes = len(fn())
+                results.append({
+                    "case": f"serialize:{name}:items={count}:{variant}",
+                    **summarize(measure(fn, iterations), payload_bytes),
+                })
+    return results
+
+
+async def bench_routes(iterations: int) -> List[Dict[str, Any]]:
+    from ..config import Setting, create_app
+
+    results = []
+    for fast_path in (False, True):
+        app = create_app(Setting(json_fast_path=fast_path))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, template in ROUTES.items():
+                path = template.format(item_id="baz")
+
+                async def request() -> None:
+                    response = await client.get(path)
+                    response.raise_for_status()
+
+                first = await client.get(path)
+                samples = await measure_async(request, iterations)
+                label = "compiled" if fast_path else "fastapi"
+                results.append({"case": f"http:{name}:{label}", **summarize(samples, len(first.content))})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="response_model include/exclude serializer benchmark")
+    parser.add_argument("--items", default="1,100,1000", help="comma separated item counts (1 = single Item)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--skip-routes", action="store_true")
+    parser.add_argument("--output", default=None, help="result json path (default: bench-results/response_models-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline result json to diff against")
+    args = parser.parse_args()
+
+    item_counts = [int(count) for count in args.items.split(",") if count]
+    results = bench_serializers(item_counts, args.iterations)
+    if not args.skip_routes:
+        if httpx is None:
+            raise SystemExit("httpx is required for route benchmarks (pip install httpx) or use --skip-routes")
+        results += asyncio.run(bench_routes(args.iterations))
+
+    print_table(results, ["p50_ms", "p95_ms", "p99_ms", "ops_per_sec"])
+    path = write_results("response_models", results, args.output)
+    print(f"\nresults written to {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
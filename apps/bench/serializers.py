@@ -0,0 +1,113 @@
+# json vs orjson vs msgspec 직렬화 벤치마크
+# 네트워크 없이 ASGI transport로 앱을 직접 호출해서 라우트 단위 지연 시간과 인코더 자체 비용을 함께 측정
+#
+# 사용 예시
+#   python -m apps.bench.serializers --sizes 100,500,1800 --iterations 30
+#   python -m apps.bench.serializers --compare bench-results/serializers-abc1234.json
+import argparse
+import asyncio
+from typing import Any, Callable, Dict, List
+
+from ..service.response_cache import ENCODERS
+from ..service.test_json_orjson import get_test_data_v2
+from .common import (
+    compare, measure, measure_async, peak_rss_bytes, print_table,
+    summarize, traced_peak, traced_peak_async, write_results,
+)
+
+# httpx는 ASGI transport 용도로만 필요, 앱 실행에는 필요 없으므로 requirements에 포함하지 않음
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+def raw_encoders() -> Dict[str, Callable[[Any], bytes]]:
+    encoders = dict(ENCODERS)
+    if msgspec is not None:
+        encoders["msgspec"] = msgspec.json.Encoder().encode
+    return encoders
+
+
+def bench_encoders(sizes: List[int], iterations: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        payload = get_test_data_v2(user_count=size)
+        for name, encode in raw_encoders().items():
+            payload_bytes = len(encode(payload))
+            samples = measure(lambda: encode(payload), iterations)
+            results.append({
+                "case": f"encode:{name}:users={size}",
+                **summarize(samples, payload_bytes),
+                "traced_peak_bytes": traced_peak(lambda: encode(payload)),
+                "rss_peak_bytes": peak_rss_bytes(),
+            })
+    return results
+
+
+async def bench_routes(sizes: List[int], iterations: int, accept_encoding: str) -> List[Dict[str, Any]]:
+    from ..main import app
+
+    # /json, /orjson은 고정 크기(1800명), 캐시된 응답과 ?stream=1 비교
+    # 크기별 직렬화 비용은 매 요청 직렬화하는 /synthetic으로 측정
+    paths = [
+        "/l_fastapi/json",
+        "/l_fastapi/orjson",
+        "/l_fastapi/json?stream=1",
+        "/l_fastapi/orjson?stream=1",
+    ]
+    for size in sizes:
+        for encoder in ENCODERS:
+            paths.append(f"/l_fastapi/synthetic?users={size}&encoder={encoder}")
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": accept_encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for path in paths:
+            async def request() -> None:
+                response = await client.get(path)
+                response.raise_for_status()
+
+            first = await client.get(path)
+            samples = await measure_async(request, iterations)
+            results.append({
+                "case": f"http:{path}",
+                **summarize(samples, len(first.content)),
+                "traced_peak_bytes": await traced_peak_async(request),
+                "rss_peak_bytes": peak_rss_bytes(),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="json/orjson/msgspec serializer benchmark")
+    parser.add_argument("--sizes", default="100,500,1800,5000", help="comma separated user counts")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--accept-encoding", default="identity", help="Accept-Encoding for route cases")
+    parser.add_argument("--skip-routes", action="store_true")
+    parser.add_argument("--output", default=None, help="result json path (default: bench-results/serializers-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline result json to diff against")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = bench_encoders(sizes, args.iterations)
+    if not args.skip_routes:
+        if httpx is None:
+            raise SystemExit("httpx is required for route benchmarks (pip install httpx) or use --skip-routes")
+        results += asyncio.run(bench_routes(sizes, args.iterations, args.accept_encoding))
+
+    print_table(results, ["p50_ms", "p95_ms", "p99_ms", "ops_per_sec", "mb_per_sec", "traced_peak_bytes"])
+    path = write_results("serializers", results, args.output)
+    print(f"\nresults written to {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# SQLite 프로파일(default vs tuned) 읽기/쓰기 처리량 벤치마크
+# 같은 스키마의 임시 파일 DB를 프로파일마다 새로 만들고 앱과 같은 user_service 함수로 측정
+#
+# 사용 예시
+#   python -m apps.bench.sqlite_profiles --writes 300 --reads 2000 --concurrency 16
+#   python -m apps.bench.sqlite_profiles --compare bench-results/sqlite_profiles-abc1234.json
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+from ..config import Setting
+from ..db.database import create_engine_from_settings, create_session_factory, create_tables
+from ..service import user_service
+from ..service.test_json_orjson import get_test_data_v2
+from .common import compare, print_table, summarize, write_results
+
+PROFILES = ("default", "tuned")
+
+
+async def timed_ops(op, count: int, concurrency: int) -> List[float]:
+    # count번의 op를 concurrency개 task로 나눠 실행, 작업별 소요 시간(초) 반환
+    samples: List[float] = []
+
+    async def worker(n: int) -> None:
+        for i in range(n):
+            start = time.perf_counter()
+            await op(i)
+            samples.append(time.perf_counter() - start)
+
+    per_worker, rest = divmod(count, concurrency)
+    await asyncio.gather(*(worker(per_worker + (1 if i < rest else 0)) for i in range(concurrency)))
+    return samples
+
+
+def throughput(name: str, profile: str, samples: List[float], elapsed: float) -> Dict[str, Any]:
+    # 동시 실행이므로 ops_per_sec는 벽시계 시간 기준으로 다시 계산
+    return {
+        "case": f"{name}:{profile}",
+        **summarize(samples),
+        "ops_per_sec": len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+async def bench_profile(profile: str, directory: str, writes: int, reads: int, concurrency: int) -> List[Dict[str, Any]]:
+    path = os.path.join(directory, f"{profile}.sqlite3")
+    settings = Setting(database_url=f"sqlite+aiosqlite:///{path}", sqlite_profile=profile)
+    engine = create_engine_from_settings(settings)
+    session_factory = create_session_factory(engine)
+    results = []
+    try:
+        await create_tables(engine)
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+
+        # 대량 입력: test_data_v2 1800명 + 주소
+        users = user_service.users_from_dataset(get_test_data_v2()["users"])
+        start = time.perf_counter()
+        async with session_factory() as session:
+            await user_service.bulk_upsert_users(session, users, settings.bulk_chunk_size)
+        elapsed = time.perf_counter() - start
+        results.append({**throughput("write:bulk_1800", profile, [elapsed], elapsed), "journal_mode": journal_mode})
+
+        # 한 건씩 커밋: synchronous/journal_mode에 따른 fsync 비용이 그대로 드러남
+        async def create(i: int) -> None:
+            async with session_factory() as session:
+                await user_service.create_user(session, f"bench{i}", None, [f"bench{i}@example.com"])
+
+        start = time.perf_counter()
+        samples = await timed_ops(create, writes, concurrency)
+        results.append(throughput("write:commit_per_row", profile, samples, time.perf_counter() - start))
+
+        ids = [user["id"] for user in users]
+        rng = random.Random(0)
+
+        async def read_one(i: int) -> None:
+            async with session_factory() as session:
+                await user_service.get_user(session, rng.choice(ids))
+
+        start = time.perf_counter()
+        samples = await timed_ops(read_one, reads, concurrency)
+        results.append(throughput("read:point", profile, samples, time.perf_counter() - start))
+
+        async def read_page(i: int) -> None:
+            async with session_factory() as session:
+                await user_service.list_users(session, 100, offset=(i * 100) % len(ids))
+
+        start = time.perf_counter()
+        samples = await timed_ops(read_page, reads // 10, concurrency)
+        results.append(throughput("read:page_100", profile, samples, time.perf_counter() - start))
+
+        # 쓰기와 읽기를 동시에: rollback journal에서는 쓰기 커밋 동안 읽기가 막힘
+        async def mixed(i: int) -> None:
+            if i % 10 == 0:
+                await create(writes + i)
+            else:
+                await read_one(i)
+
+        start = time.perf_counter()
+        samples = await timed_ops(mixed, reads, concurrency)
+        results.append(throughput("mixed:10pct_write", profile, samples, time.perf_counter() - start))
+    finally:
+        await engine.dispose()
+    return results
+
+
+async def run(profiles: List[str], writes: int, reads: int, concurrency: int) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in profiles:
+            results += await bench_profile(profile, directory, writes, reads, concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite default vs tuned profile benchmark")
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--writes", type=int, default=300, help="single-row commits")
+    parser.add_argument("--reads", type=int, default=2000, help="point reads (page reads = reads / 10)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", default=None, help="result json path (default: bench-results/sqlite_profiles-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="baseline result json to diff against")
+    args = parser.parse_args()
+
+    profiles = [profile for profile in args.profiles.split(",") if profile]
+    results = asyncio.run(run(profiles, args.writes, args.reads, args.concurrency))
+
+    print_table(results, ["p50_ms", "p95_ms", "p99_ms", "ops_per_sec"])
+    path = write_results("sqlite_profiles", results, args.output)
+    print(f"\nresults written to {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 # fastapi 설정 및 환경 변수 정의
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from .api.v1 import api_router
+from .api.v1.l_fastapi import templates
+from .core.compression import CompressedVariantCache, CompressionMiddleware
+from .core.routing import FAST_PATH_STATE, RESPONSE_CLASSES
+from .core.static import HashedStaticFiles
+from .core.timing import TimingMiddleware, timing_store
+from .db.database import create_engine_from_settings, create_session_factory, create_tables
+from .db.query_counter import install_query_counter
+from .db.statements import statements
+from .service.items import item_cache
+from .service.response_cache import response_cache
+from .service.shared_dataset import shared_store
 
 BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
 STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
@@ -13,8 +25,93 @@ STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
 class Setting(BaseSettings):
     model_config = SettingsConfigDict(env_file=BASE_DIR)
 
-def create_app() -> FastAPI:
-    app: FastAPI = FastAPI()
+    # 응답 압축 설정, minimum_size 미만은 압축하지 않음
+    compression_minimum_size: int = 1024
+    # 이 크기 이상의 본문은 스레드 풀에서 압축하여 이벤트 루프 블로킹 방지
+    compression_offload_size: int = 256 * 1024
+    compression_level: int = 6
+    # 압축본 캐시 개수(strong ETag + 인코딩 단위), 0이면 캐시하지 않음
+    compression_cache_size: int = 16
+
+    # response_class를 지정하지 않은 라우트의 기본 응답 클래스
+    default_response_class: Literal["json", "orjson"] = "orjson"
+    # response_model 없는 라우트가 JSON 기본 타입을 반환하면 jsonable_encoder 생략
+    json_fast_path: bool = True
+
+    # 라우트별 단계 지연 시간 히스토그램 수집(/_timing 에서 조회)
+    timing_enabled: bool = True
+
+    # DB 설정, 로컬에서는 aiosqlite 기반 파일 DB 사용
+    database_url: str = "sqlite+aiosqlite:///./db.sqlite3"
+    db_echo: bool = False
+    # 워커(프로세스)당 연결 풀 크기
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # 엔진의 compiled cache 크기(SQLAlchemy 기본 500), 문장 구조가 다른 쿼리마다 한 칸씩 사용
+    db_query_cache_size: int = 1200
+    # SQLite 연결마다 적용할 PRAGMA 설정(database.sqlite_pragmas), default면 SQLite 기본값 그대로 사용
+    # tuned: 여러 워커(프로세스)가 같은 파일을 공유할 때 읽기가 쓰기에 막히지 않도록 WAL 사용
+    sqlite_profile: Literal["default", "tuned"] = "tuned"
+    sqlite_journal_mode: str = "WAL"
+    # WAL에서는 NORMAL이어도 DB가 손상되지 않음(전원 장애 시 마지막 커밋만 유실 가능), 커밋마다 fsync 생략
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    # 음수는 KiB 단위(-16384 = 16MiB), 연결마다 따로 잡히므로 최대 워커 수 * (pool_size + max_overflow)배 사용
+    # 읽기는 대부분 mmap 영역에서 처리되므로 크게 잡지 않음
+    sqlite_cache_size: int = -16384
+    # 다른 워커가 쓰기 잠금을 잡고 있을 때 바로 "database is locked" 대신 대기하는 시간
+    sqlite_busy_timeout_ms: int = 5000
+    # 아이템 조회 read-through 캐시(service.items.item_cache) 크기/유효 시간(초)
+    item_cache_size: int = 1024
+    item_cache_ttl: float = 60.0
+    # Jinja2 컴파일 결과(bytecode) 디스크 캐시 사용 여부/저장 위치, None이면 임시 디렉터리 아래 사용자별 폴더(워커/재시작 간 공유)
+    template_bytecode_cache: bool = True
+    template_bytecode_cache_dir: str | None = None
+    # 요청마다 템플릿 파일 수정 여부 확인, 배포 환경에서는 False로 stat 호출 생략
+    template_auto_reload: bool = True
+    # 템플릿 렌더 결과 캐시(core.templating) 크기/유효 시간(초), 0이면 캐시하지 않음
+    template_cache_size: int = 256
+    template_cache_ttl: float = 300.0
+    # 직렬화 데이터셋(/l_fastapi/json, /orjson)을 워커 간 공유 파일(mmap)로 한 벌만 생성
+    # 디렉터리가 None이면 /dev/shm(없으면 임시 디렉터리) 아래 사용자별 디렉터리
+    # 지정한 디렉터리도 현재 사용자 소유이고 다른 사용자 권한이 없어야 함(없으면 0700으로 생성)
+    shared_datasets: bool = True
+    shared_dataset_dir: str | None = None
+    # /l_fastapi/batch 에서 동시에 실행하는 작업 묶음 수
+    batch_concurrency: int = 32
+    # 대량 입력 시 한 번의 executemany로 보내는 행 수
+    bulk_chunk_size: int = 500
+    # 라우트별 쿼리 수 상한(query_budget) 초과 시 처리, 테스트/개발 환경에서는 raise로 N+1 회귀를 실패 처리
+    query_budget_mode: Literal["off", "warn", "raise"] = "warn"
+
+def create_app(settings: Setting | None = None) -> FastAPI:
+    settings = settings or Setting()
+
+    # 워커 시작 시 엔진/세션 팩토리 생성 및 테이블 생성, 종료 시 연결 풀 정리
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        engine = create_engine_from_settings(settings)
+        app.state.engine = engine
+        if settings.query_budget_mode != "off":
+            install_query_counter(engine)
+        statements.install(engine)
+        app.state.session_factory = create_session_factory(engine)
+        await create_tables(engine)
+        # 압축본 캐시는 앱마다 따로 있으므로 앱이 실행되는 동안만 전역 response_cache에 연결
+        # (create_app을 여러 번 호출해도 리스너가 쌓이지 않음)
+        response_cache.on_invalidate(compressed_variants.clear)
+        try:
+            yield
+        finally:
+            response_cache.remove_listener(compressed_variants.clear)
+            await engine.dispose()
+
+    app: FastAPI = FastAPI(
+        default_response_class=RESPONSE_CLASSES[settings.default_response_class],
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
 
     # 모든 출처에서의 요청을 허용하기 위한 CORS 설정
     app.add_middleware(
@@ -25,10 +122,39 @@ def create_app() -> FastAPI:
         allow_headers=["*"],  # 모든 헤더 허용
     )
 
+    # Accept-Encoding 협상 기반 응답 압축, 캐시된 페이로드의 압축본도 함께 캐시
+    compressed_variants = CompressedVariantCache(settings.compression_cache_size)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        offload_size=settings.compression_offload_size,
+        level=settings.compression_level,
+        variant_cache=compressed_variants,
+    )
+
+    # 라우트별 지연 시간 측정, 압축/전송 시간까지 포함하도록 가장 바깥쪽에 추가
+    if settings.timing_enabled:
+        app.add_middleware(TimingMiddleware, store=timing_store)
+
     # 정적 파일 저장소 마운트, css, js 등
-    app.mount('/static', StaticFiles(directory=STATIC_DIR), name='static')
+    # 해시 이름(styles.<hash>.css)은 immutable 캐시, 미리 압축한 .gz/.br가 있으면 그대로 전송(core.static)
+    app.mount('/static', HashedStaticFiles(directory=STATIC_DIR), name='static')
+
+    item_cache.configure(maxsize=settings.item_cache_size, ttl=settings.item_cache_ttl)
+    shared_store.configure(directory=settings.shared_dataset_dir, enabled=settings.shared_datasets)
+    templates.configure(
+        bytecode_cache=settings.template_bytecode_cache,
+        bytecode_cache_dir=settings.template_bytecode_cache_dir,
+        auto_reload=settings.template_auto_reload,
+        cache_size=settings.template_cache_size,
+        cache_ttl=settings.template_cache_ttl,
+    )
 
     # 하위 엔드포인트 APIRouter 추가 
+    # 라우트 핸들러는 include 시점에 다시 만들어지므로 fast path 설정을 먼저 반영(앱별 설정, core.routing)
+    setattr(app.state, FAST_PATH_STATE, settings.json_fast_path)
     app.include_router(api_router)
+    # 정적 파일 URL(해시 이름)은 마운트/라우트가 모두 등록된 뒤 미리 계산
+    templates.bind(app)
 
-    return app
\ No newline at end of file
+    return app
@@ -0,0 +1,311 @@
+# Accept-Encoding 협상 기반 응답 압축 미들웨어, 수 MB 단위 JSON 응답을 기준으로 조정
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli, zstandard는 설치되어 있을 때만 협상 대상에 포함
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+class _BrotliStream:
+    # brotli.Compressor를 zlib compressobj와 같은 compress/flush 인터페이스로 맞춤
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class Codec:
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        compressobj: Callable[[], Any],
+    ) -> None:
+        self.name = name
+        self.compress = compress
+        self.compressobj = compressobj
+
+
+def build_codecs(level: int) -> Dict[str, Codec]:
+    # mtime=0: 같은 입력이면 같은 gzip 바이트가 나오도록 고정
+    codecs = {
+        "gzip": Codec(
+            "gzip",
+            lambda data: gzip.compress(data, compresslevel=level, mtime=0),
+            lambda: zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+        ),
+        # HTTP의 deflate는 zlib 포맷을 의미
+        "deflate": Codec(
+            "deflate",
+            lambda data: zlib.compress(data, level),
+            lambda: zlib.compressobj(level),
+        ),
+    }
+    if brotli is not None:
+        # brotli 최고 품질(11)은 수 MB 응답에 너무 느리므로 gzip 레벨에 맞춰 낮게 사용
+        quality = min(level, 11)
+        codecs["br"] = Codec(
+            "br",
+            lambda data: brotli.compress(data, quality=quality),
+            lambda: _BrotliStream(quality),
+        )
+    if zstandard is not None:
+        zstd_level = min(level, 19)
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data: zstandard.ZstdCompressor(level=zstd_level).compress(data),
+            lambda: zstandard.ZstdCompressor(level=zstd_level).compressobj(),
+        )
+    return codecs
+
+
+# 같은 q 값이면 이 순서대로 선호
+PREFERENCE: Tuple[str, ...] = ("zstd", "br", "gzip", "deflate")
+
+T = TypeVar("T")
+
+
+def negotiate(accept_encoding: str, available: Dict[str, T]) -> T | None:
+    # available: 인코딩 이름 -> 값(Codec, 미리 압축한 파일 등), PREFERENCE에 있는 이름만 사용
+    best: Tuple[float, int] | None = None
+    chosen: T | None = None
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        candidates = available if name == "*" else ([name] if name in available else [])
+        for candidate in candidates:
+            if quality <= 0:
+                continue
+            rank = (quality, -PREFERENCE.index(candidate))
+            if best is None or rank > best:
+                best, chosen = rank, available[candidate]
+    return chosen
+
+
+class CompressedVariantCache:
+    # strong ETag + 인코딩 별로 압축 결과를 보관하는 LRU
+    # ETag가 본문 해시이므로 원본이 바뀌면 키가 달라져 자연히 사용되지 않음
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str) -> bytes | None:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+            return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[(etag, encoding)] = body
+            self._entries.move_to_end((etag, encoding))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self, key: str | None = None) -> None:
+        # ResponseCache.on_invalidate 리스너 시그니처와 맞춤
+        with self._lock:
+            self._entries.clear()
+
+
+# 압축할 응답(codec 협상됨)이면 scope에 미들웨어를 기록, 304 응답이 200과 같은 ETag 형식을 쓰도록 참조
+SCOPE_KEY = "compression"
+
+
+def representation_etag(scope: Scope, etag: str, content_type: str, size: int) -> str:
+    """같은 요청에 200을 보냈다면 실제로 전송됐을 ETag
+
+    CompressionMiddleware가 압축한 응답은 ETag가 weak(W/)로 바뀌므로, 본문 없이 보내는 304도
+    같은 조건(협상된 codec, 압축 대상 형식, minimum_size 이상)이면 weak로 맞춰서 클라이언트의 검증자가 바뀌지 않게 한다.
+    """
+    middleware = scope.get(SCOPE_KEY)
+    if (
+        middleware is not None
+        and not etag.startswith("W/")
+        and size >= middleware.minimum_size
+        and is_compressible(content_type)
+    ):
+        return "W/" + etag
+    return etag
+
+
+class CompressionMiddleware:
+    """gzip/deflate(+br/zstd) 응답 압축
+
+    minimum_size 미만의 응답(/ health, /plaintext 등)은 건드리지 않고,
+    offload_size 이상의 본문은 이벤트 루프를 막지 않도록 스레드 풀에서 압축한다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+        level: int = 6,
+        variant_cache: CompressedVariantCache | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.codecs = build_codecs(level)
+        self.variant_cache = variant_cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] != "HEAD":
+            headers = Headers(scope=scope)
+            codec = negotiate(headers.get("accept-encoding", ""), self.codecs)
+            if codec is not None:
+                scope[SCOPE_KEY] = self
+                responder = CompressionResponder(self.app, self, codec)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, middleware: CompressionMiddleware, codec: Codec) -> None:
+        self.app = app
+        self.middleware = middleware
+        self.codec = codec
+        self.send: Send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.stream: Any = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 헤더 수정 여부가 본문 첫 조각을 봐야 결정되므로 보류
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+        elif message_type != "http.response.body" or self.passthrough:
+            # pathsend 등 본문 외 메시지와 압축 대상이 아닌 응답은 그대로 전달
+            # http.response.debug(TestClient)처럼 start 이전에 오는 메시지도 있으므로 start를 받은 경우에만 먼저 전송
+            if self.initial_message and not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        elif not self.started:
+            self.started = True
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) < self.middleware.minimum_size and not more_body:
+                await self.send(self.initial_message)
+                await self.send(message)
+            elif not more_body:
+                message["body"] = await self.compress_body(body)
+                headers = self.compressed_headers()
+                headers["Content-Length"] = str(len(message["body"]))
+                await self.send(self.initial_message)
+                await self.send(message)
+            else:
+                # 스트리밍 응답은 조각 단위로 압축, 원본 길이를 모르므로 Content-Length 제거
+                self.stream = self.codec.compressobj()
+                headers = self.compressed_headers()
+                del headers["Content-Length"]
+                message["body"] = await self.compress_chunk(body, more_body)
+                await self.send(self.initial_message)
+                await self.send(message)
+        else:
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            message["body"] = await self.compress_chunk(body, more_body)
+            await self.send(message)
+
+    def compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+        # 표현이 달라졌으므로 strong ETag를 weak로 변경, If-None-Match는 weak 비교로 계속 일치
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return headers
+
+    async def compress_chunk(self, body: bytes, more_body: bool) -> bytes:
+        # 조각은 순서대로 await되므로 compressobj를 스레드에서 써도 동시에 접근하지 않음
+        if len(body) >= self.middleware.offload_size:
+            data = body if isinstance(body, bytes) else bytes(body)
+            return await anyio.to_thread.run_sync(self._compress_chunk, data, more_body)
+        return self._compress_chunk(body, more_body)
+
+    def _compress_chunk(self, body: bytes, more_body: bool) -> bytes:
+        data = self.stream.compress(body)
+        if not more_body:
+            data += self.stream.flush()
+        return data
+
+    async def compress_body(self, body: bytes) -> bytes:
+        headers = Headers(raw=self.initial_message["headers"])
+        etag = headers.get("etag")
+        cache = self.middleware.variant_cache if etag and not etag.startswith("W/") else None
+        if cache is not None:
+            cached = cache.get(etag, self.codec.name)
+            if cached is not None:
+                return cached
+        if len(body) >= self.middleware.offload_size:
+            # 캐시된 본문은 memoryview(mmap)일 수 있음, 이미 bytes면 복사하지 않음
+            data = body if isinstance(body, bytes) else bytes(body)
+            compressed = await anyio.to_thread.run_sync(self.codec.compress, data)
+        else:
+            compressed = self.codec.compress(body)
+        if cache is not None:
+            cache.put(etag, self.codec.name, compressed)
+        return compressed
@@ -0,0 +1,172 @@
+# response_model 라우트용 미리 만들어 둔 직렬화기
+# FastAPI 기본 경로: 반환값 검증(validate_python) -> include/exclude 적용해 dict 생성(dump_python) -> jsonable 값 -> JSON 인코딩
+# 여기서는 (모델, include, exclude, exclude_unset...) 조합별로 직렬화기를 라우트 등록 시점에 한 번 만들어 두고
+# 검증 후 dump_json으로 projection과 JSON 인코딩을 한 번에 처리(중간 dict를 만들지 않음)
+# trusted_response로 표시한 라우트는 검증도 생략하고 dict에서 필요한 키만 골라 바로 인코딩
+import copy
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from fastapi.exceptions import ResponseValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# 내부에서 만든 데이터(검증이 끝난 데이터)를 반환하는 엔드포인트 표시
+TRUSTED_ATTR = "__trusted_response__"
+
+
+def trusted_response(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """반환값을 response_model로 다시 검증하지 않는 엔드포인트로 표시
+
+    반환값은 response_model 필드 이름을 키로 갖는 JSON 기본 타입 dict(또는 그 리스트)여야 한다.
+    타입 변환(int -> float 등)과 중첩 모델의 include/exclude는 적용되지 않는다.
+    """
+    setattr(endpoint, TRUSTED_ATTR, True)
+    return endpoint
+
+
+def is_trusted_response(endpoint: Callable[..., Any]) -> bool:
+    return getattr(endpoint, TRUSTED_ATTR, False)
+
+
+def _freeze(value: Any) -> Hashable:
+    # include/exclude(set 또는 중첩 dict)를 캐시 키로 쓸 수 있게 변환
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def _thaw(value: Hashable) -> Any:
+    if isinstance(value, tuple):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(annotation: Any) -> TypeAdapter:
+    # 같은 response_model을 쓰는 라우트끼리 스키마/검증기/직렬화기 공유
+    return TypeAdapter(annotation)
+
+
+class ResponseSerializer:
+    def __init__(
+        self,
+        annotation: Any,
+        include: Any = None,
+        exclude: Any = None,
+        by_alias: bool = True,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> None:
+        self.adapter = _type_adapter(annotation)
+        self.dump_options = dict(
+            include=include,
+            exclude=exclude,
+            by_alias=by_alias,
+            exclude_unset=exclude_unset,
+            exclude_defaults=exclude_defaults,
+            exclude_none=exclude_none,
+        )
+        self.projection = _build_projection(annotation, include, exclude, by_alias)
+
+    def validate(self, content: Any) -> Any:
+        # FastAPI(ModelField.validate)와 같이 ORM 객체도 허용, 실패 시 같은 예외 형식
+        try:
+            return self.adapter.validate_python(content, from_attributes=True)
+        except ValidationError as exc:
+            errors = [
+                {**error, "loc": ("response", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+            raise ResponseValidationError(errors=errors, body=content)
+
+    def to_json(self, content: Any) -> bytes:
+        return self.adapter.dump_json(self.validate(content), **self.dump_options)
+
+    def project(self, content: Any) -> Any:
+        # trusted 경로: 검증 없이 필드만 골라낸 dict(리스트면 원소별)
+        if self.projection is None:
+            raise TypeError("Response model does not support the trusted projection")
+        if isinstance(content, list):
+            return [self._project_one(item) for item in content]
+        return self._project_one(content)
+
+    def _project_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        options = self.dump_options
+        result = {}
+        for name, key, default, has_default in self.projection:
+            if name in item:
+                value = item[name]
+                if options["exclude_defaults"] and has_default and value == default:
+                    continue
+            elif options["exclude_unset"] or not has_default:
+                continue
+            else:
+                value = copy.copy(default)
+            if options["exclude_none"] and value is None:
+                continue
+            result[key] = value
+        return result
+
+
+# (필드 이름, 출력 키, 기본값, 기본값 여부) 목록, include/exclude를 미리 적용
+# 최상위 필드 이름 집합만 지원(중첩 include/exclude, 모델이 아닌 response_model이면 None)
+Projection = List[Tuple[str, str, Any, bool]]
+
+
+def _build_projection(annotation: Any, include: Any, exclude: Any, by_alias: bool) -> Projection | None:
+    model = annotation
+    origin = getattr(annotation, "__origin__", None)
+    if origin in (list, List):
+        model = annotation.__args__[0]
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        return None
+    if isinstance(include, dict) or isinstance(exclude, dict):
+        return None
+    projection: Projection = []
+    for name, field in model.model_fields.items():
+        if include is not None and name not in include:
+            continue
+        if exclude is not None and name in exclude:
+            continue
+        has_default = not field.is_required()
+        default = field.get_default(call_default_factory=True) if has_default else None
+        key = (field.serialization_alias or field.alias or name) if by_alias else name
+        projection.append((name, key, default, has_default))
+    return projection
+
+
+@lru_cache(maxsize=None)
+def _cached_serializer(
+    annotation: Any,
+    include: Hashable,
+    exclude: Hashable,
+    by_alias: bool,
+    exclude_unset: bool,
+    exclude_defaults: bool,
+    exclude_none: bool,
+) -> ResponseSerializer:
+    return ResponseSerializer(
+        annotation, _thaw(include), _thaw(exclude),
+        by_alias, exclude_unset, exclude_defaults, exclude_none,
+    )
+
+
+def response_serializer(
+    annotation: Any,
+    include: Any = None,
+    exclude: Any = None,
+    by_alias: bool = True,
+    exclude_unset: bool = False,
+    exclude_defaults: bool = False,
+    exclude_none: bool = False,
+) -> ResponseSerializer:
+    # 같은 조합은 같은 직렬화기를 공유
+    return _cached_serializer(
+        annotation, _freeze(include), _freeze(exclude),
+        by_alias, exclude_unset, exclude_defaults, exclude_none,
+    )
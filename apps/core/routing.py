@@ -0,0 +1,179 @@
+# JSON 응답 fast path와 엔드포인트 실행 시간 표시를 가진 APIRoute
+# 반환 타입 힌트가 JSON 기본 타입(dict, list, str 등의 조합)인 라우트는 jsonable_encoder를 거치지 않고 바로 인코딩
+# (fast path 적용 여부는 라우트 등록 시 타입 힌트로 결정, 힌트가 없으면 FastAPI 기본 경로)
+# response_model이 있는 라우트는 등록 시 만든 직렬화기(response_model.ResponseSerializer)로 검증과 인코딩을 한 번에 처리
+import dataclasses
+import functools
+import inspect
+import types
+from typing import Any, Callable, Coroutine, Dict, Type, Union, get_args, get_origin
+
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, get_request_handler
+from fastapi.utils import is_body_allowed_for_status_code
+
+from ..service.response_cache import encode_json, encode_orjson
+from .response_model import ResponseSerializer, is_trusted_response, response_serializer
+from .timing import timed_call
+
+# Setting.default_response_class 값과 응답 클래스 매핑
+RESPONSE_CLASSES: Dict[str, Type[Response]] = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+# 응답 클래스별로 render와 같은 결과를 내는 인코더
+FAST_ENCODERS: Dict[Type[Response], Callable[[Any], bytes]] = {
+    JSONResponse: encode_json,
+    ORJSONResponse: encode_orjson,
+}
+
+JSON_NATIVE_TYPES = (dict, list, str, int, float, bool, type(None))
+
+# 앱별 fast path 사용 여부(app.state), create_app에서 Setting.json_fast_path 값으로 지정
+FAST_PATH_STATE = "json_fast_path"
+
+
+def is_json_native(annotation: Any) -> bool:
+    # dict/list/스칼라와 그 조합(Dict[str, Any], List[dict], Optional[...] 등)인지, Any는 JSON 기본 타입으로 간주
+    if annotation is Any or annotation in JSON_NATIVE_TYPES:
+        return True
+    origin = get_origin(annotation)
+    if origin in (dict, list, Union, types.UnionType):
+        return all(is_json_native(arg) for arg in get_args(annotation))
+    return False
+
+
+def _uses_response_param(dependant: Dependant) -> bool:
+    # Response 파라미터로 헤더/상태코드를 바꾸는 라우트는 FastAPI가 응답에 병합해야 하므로 fast path 제외
+    if dependant.response_param_name is not None:
+        return True
+    return any(_uses_response_param(sub) for sub in dependant.dependencies)
+
+
+def fast_json_call(
+    call: Callable[..., Any],
+    encode: Callable[[Any], bytes],
+    media_type: str,
+    status_code: int,
+) -> Callable[..., Any]:
+    # 반환 타입 힌트가 JSON 기본 타입인 라우트에만 사용, 예외 처리용 Response는 그대로 전달
+    def render(content: Any) -> Any:
+        if isinstance(content, Response):
+            return content
+        return Response(content=encode(content), status_code=status_code, media_type=media_type)
+
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(**values: Any) -> Any:
+            return render(await call(**values))
+        return async_wrapper
+
+    # 동기 함수는 스레드 풀에서 실행되므로 인코딩도 같은 스레드에서 처리
+    @functools.wraps(call)
+    def sync_wrapper(**values: Any) -> Any:
+        return render(call(**values))
+    return sync_wrapper
+
+
+def compiled_response_call(
+    call: Callable[..., Any],
+    serializer: ResponseSerializer,
+    encode: Callable[[Any], bytes],
+    trusted: bool,
+    media_type: str,
+    status_code: int,
+) -> Callable[..., Any]:
+    # response_model 라우트: 미리 만든 직렬화기로 검증 + projection + 인코딩을 한 번에 처리
+    def render(content: Any) -> Any:
+        if isinstance(content, Response):
+            return content
+        if trusted:
+            body = encode(serializer.project(content))
+        else:
+            body = serializer.to_json(content)
+        return Response(content=body, status_code=status_code, media_type=media_type)
+
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(**values: Any) -> Any:
+            return render(await call(**values))
+        return async_wrapper
+
+    @functools.wraps(call)
+    def sync_wrapper(**values: Any) -> Any:
+        return render(call(**values))
+    return sync_wrapper
+
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        # 반환 타입 힌트(또는 response_model)가 JSON 기본 타입이면 fast path로 바로 인코딩
+        # response_model은 그대로 두어 OpenAPI 스키마는 유지하고, 실행 시 검증(dict 검증은 의미가 없음)만 생략
+        # include_router로 다시 만들 때는 추론된 response_model이 그대로 전달됨
+        response_model = kwargs.get("response_model", DefaultPlaceholder(None))
+        if isinstance(response_model, DefaultPlaceholder) or response_model is None:
+            response_model = get_typed_return_annotation(endpoint)
+        self.json_native = response_model is not None and is_json_native(response_model)
+        super().__init__(path, endpoint, **kwargs)
+
+    @property
+    def fast_path_enabled(self) -> bool:
+        # 앱에 등록된 라우트(include_router로 다시 만든 라우트)는 그 앱의 설정을 따름, 앱마다 다르게 지정 가능
+        state = getattr(self.dependency_overrides_provider, "state", None)
+        return getattr(state, FAST_PATH_STATE, True)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        # TimingMiddleware의 handler 구간 측정을 위해 엔드포인트 호출 전후를 표시
+        call = timed_call(self.dependant.call, inspect.iscoroutinefunction(self.dependant.call))
+        response_field = self.secure_cloned_response_field
+
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        encode = FAST_ENCODERS.get(response_class)
+        if (
+            self.fast_path_enabled
+            and encode is not None
+            and is_body_allowed_for_status_code(self.status_code)
+            and not _uses_response_param(self.dependant)
+        ):
+            # 인코딩은 handler 구간이 끝난 뒤(serialization 구간)에 실행되도록 바깥쪽에서 감쌈
+            if self.json_native:
+                call = fast_json_call(call, encode, response_class.media_type, self.status_code or 200)
+                response_field = None
+            elif self.response_field is not None:
+                serializer = response_serializer(
+                    self.response_model,
+                    include=self.response_model_include,
+                    exclude=self.response_model_exclude,
+                    by_alias=self.response_model_by_alias,
+                    exclude_unset=self.response_model_exclude_unset,
+                    exclude_defaults=self.response_model_exclude_defaults,
+                    exclude_none=self.response_model_exclude_none,
+                )
+                call = compiled_response_call(
+                    call, serializer, encode, is_trusted_response(self.endpoint),
+                    response_class.media_type, self.status_code or 200,
+                )
+
+        dependant = dataclasses.replace(self.dependant, call=call)
+        return get_request_handler(
+            dependant=dependant,
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
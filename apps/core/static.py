@@ -0,0 +1,226 @@
+# 정적 파일 파이프라인
+# - 시작 시 static 디렉터리를 훑어 파일별 내용 해시로 이름을 붙인 manifest 생성(styles.css -> styles.<hash>.css)
+#   해시 이름으로 요청하면 내용이 바뀌지 않으므로 Cache-Control: immutable(1년), 원래 이름은 매번 재검증(no-cache + ETag)
+# - 미리 압축해 둔 .gz/.br 파일(build 단계에서 생성)이 있으면 Accept-Encoding에 맞춰 그대로 전송(요청마다 압축하지 않음)
+# - 작은 파일은 시작 시 메모리에 올려 요청마다 스레드 풀에서 stat/open/read 하지 않음
+#   큰 파일은 파일 경로로 응답하며, 서버가 http.response.pathsend 확장을 지원하면 서버가 직접 전송(zero-copy)
+#
+# 압축본 생성(배포 이미지 빌드 시)
+#   python -m apps.core.static apps/static
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import stat
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Dict, List, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from .compression import brotli, is_compressible, negotiate
+
+# 미리 압축한 파일 확장자 -> Content-Encoding
+PRECOMPRESSED: Dict[str, str] = {".br": "br", ".gz": "gzip"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass
+class AssetVariant:
+    # 원본(identity) 또는 미리 압축한 파일 하나
+    path: str
+    stat_result: os.stat_result
+    # inline_size 이하면 내용을 메모리에 보관
+    body: bytes | None = None
+
+
+@dataclass
+class Asset:
+    name: str
+    hashed_name: str
+    digest: str
+    media_type: str
+    # Content-Encoding("identity" 포함) -> 파일
+    variants: Dict[str, AssetVariant] = field(default_factory=dict)
+
+
+def hashed_filename(name: str, digest: str) -> str:
+    # css/styles.css -> css/styles.<digest>.css
+    directory, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(directory, f"{stem}.{digest}{ext}").replace(os.sep, "/")
+
+
+def file_digest(path: str, length: int = 12) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def iter_sources(directory: str) -> List[Tuple[str, str]]:
+    # (static 기준 경로, 실제 경로), 미리 압축한 파일은 제외
+    sources = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1] in PRECOMPRESSED:
+                continue
+            full_path = os.path.join(root, filename)
+            sources.append((os.path.relpath(full_path, directory).replace(os.sep, "/"), full_path))
+    return sources
+
+
+def build_manifest(directory: str, inline_size: int = 64 * 1024) -> Dict[str, Asset]:
+    """static 디렉터리의 파일별 해시 이름/미리 압축한 파일 목록
+
+    원본보다 오래된 압축본은 내용이 다를 수 있으므로 사용하지 않는다.
+    """
+    manifest: Dict[str, Asset] = {}
+    for name, full_path in iter_sources(directory):
+        stat_result = os.stat(full_path)
+        digest = file_digest(full_path)
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        asset = Asset(name, hashed_filename(name, digest), digest, media_type)
+        candidates = [("identity", full_path)] + [(encoding, full_path + ext) for ext, encoding in PRECOMPRESSED.items()]
+        for encoding, path in candidates:
+            try:
+                variant_stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(variant_stat.st_mode) or variant_stat.st_mtime < stat_result.st_mtime:
+                continue
+            body = None
+            if variant_stat.st_size <= inline_size:
+                with open(path, "rb") as file:
+                    body = file.read()
+            asset.variants[encoding] = AssetVariant(path, variant_stat, body)
+        manifest[name] = asset
+    return manifest
+
+
+class PathSendFileResponse(FileResponse):
+    # Range 요청이 아니고 서버가 pathsend 확장을 지원하면 파일 경로만 넘겨 서버가 직접 전송(sendfile 등)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        if (
+            "http.response.pathsend" in extensions
+            and scope["method"] != "HEAD"
+            and "range" not in Headers(scope=scope)
+        ):
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.pathsend", "path": self.path})
+            if self.background is not None:
+                await self.background()
+            return
+        await super().__call__(scope, receive, send)
+
+
+class HashedStaticFiles(StaticFiles):
+    """해시 이름/미리 압축한 파일/immutable 캐시를 지원하는 StaticFiles
+
+    manifest는 생성 시 한 번 만들며, 이후 추가되거나 바뀐 파일은 일반 StaticFiles처럼 원래 이름으로만 제공된다.
+    """
+
+    def __init__(self, *, directory: str, inline_size: int = 64 * 1024, **kwargs) -> None:
+        super().__init__(directory=directory, **kwargs)
+        self.manifest = build_manifest(directory, inline_size)
+        # 요청 경로(원래 이름, 해시 이름) -> (asset, immutable 여부)
+        self.routes: Dict[str, Tuple[Asset, bool]] = {}
+        for asset in self.manifest.values():
+            self.routes[asset.name] = (asset, False)
+            self.routes[asset.hashed_name] = (asset, True)
+
+    @property
+    def hashed_names(self) -> Dict[str, str]:
+        # 원래 이름 -> 해시 이름, 템플릿 url_for('static', path=...)에서 사용
+        return {name: asset.hashed_name for name, asset in self.manifest.items()}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        route = self.routes.get(path.replace(os.sep, "/"))
+        if route is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        asset, immutable = route
+        request_headers = Headers(scope=scope)
+        encodings = {encoding: encoding for encoding in asset.variants if encoding != "identity"}
+        encoding = negotiate(request_headers.get("accept-encoding", ""), encodings) if encodings else None
+        if encoding is None:
+            encoding = "identity"
+        variant = asset.variants[encoding]
+
+        headers = {
+            # 표현(인코딩)마다 다른 strong ETag
+            "etag": f'"{asset.digest}-{encoding}"',
+            "last-modified": formatdate(variant.stat_result.st_mtime, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        }
+        if encodings:
+            headers["vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+        if self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+        if variant.body is not None:
+            # HEAD 요청이면 서버가 본문을 버리고 헤더만 전송
+            return Response(variant.body, media_type=asset.media_type, headers=headers)
+        return PathSendFileResponse(
+            variant.path,
+            media_type=asset.media_type,
+            headers=headers,
+            stat_result=variant.stat_result,
+        )
+
+
+def precompress(directory: str, level: int = 9, min_ratio: float = 0.95) -> List[Tuple[str, str, int, int]]:
+    """압축 대상 파일마다 .gz(brotli가 설치되어 있으면 .br도) 생성
+
+    압축본이 원본의 min_ratio 배보다 작지 않으면 만들지 않는다(기존 파일은 삭제).
+    반환값: (파일, 인코딩, 원본 크기, 압축 크기)
+    """
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=level, mtime=0)}
+    if brotli is not None:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    results = []
+    for name, full_path in iter_sources(directory):
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if not is_compressible(media_type):
+            continue
+        with open(full_path, "rb") as file:
+            data = file.read()
+        for ext, compress in compressors.items():
+            target = full_path + ext
+            compressed = compress(data)
+            if len(compressed) >= len(data) * min_ratio:
+                if os.path.exists(target):
+                    os.remove(target)
+                continue
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            temporary = f"{target}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(compressed)
+            os.replace(temporary, target)
+            results.append((name, PRECOMPRESSED[ext], len(data), len(compressed)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="precompress static files (.gz/.br)")
+    parser.add_argument("directory", nargs="?", default=os.path.join(os.path.dirname(os.path.dirname(__file__)), "static"))
+    parser.add_argument("--level", type=int, default=9, help="gzip level")
+    args = parser.parse_args()
+
+    results = precompress(args.directory, args.level)
+    for name, encoding, size, compressed in results:
+        print(f"{name} [{encoding}] {size} -> {compressed} bytes")
+    manifest = build_manifest(args.directory)
+    for asset in manifest.values():
+        print(f"{asset.name} -> {asset.hashed_name} ({', '.join(asset.variants)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Jinja2 템플릿 렌더링
+# Jinja2Templates 기본 동작: 요청마다 url_for('static', ...)가 라우트 목록을 훑어 URL을 만들고(request.url_for),
+# 워커가 새로 뜰 때마다 모든 템플릿을 다시 컴파일
+# 여기서는
+# - 컴파일 결과(bytecode)를 디스크에 저장해 새 워커/재시작 시 컴파일 생략(FileSystemBytecodeCache)
+# - 정적 파일 URL은 bind(app) 시점에 미리 계산(static 마운트가 해시 이름을 제공하면 해시 이름), 라우트 URL은 (이름, 파라미터)별로 메모이즈
+# - URL을 요청과 무관한 경로(/static/...)로 만들기 때문에 같은 컨텍스트면 렌더 결과가 같음 -> 결과를 캐시할 수 있음
+# - enable_async 환경이라 render_async/generate_async로 렌더링, 큰 템플릿은 생성되는 대로 스트리밍
+import os
+from typing import Any, AsyncIterator, Dict, Hashable, Mapping, Tuple
+
+import jinja2
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.routing import Mount
+
+from ..service.cache import AsyncTTLCache
+
+# (템플릿 이름, 정렬된 컨텍스트 항목)
+RenderKey = Tuple[str, Tuple[Tuple[str, Hashable], ...]]
+
+
+class TemplateRenderer:
+    def __init__(
+        self,
+        directory: str,
+        static_dir: str | None = None,
+        static_name: str = "static",
+        cache_size: int = 256,
+        cache_ttl: float = 300.0,
+    ) -> None:
+        self.directory = directory
+        self.static_dir = static_dir
+        self.static_name = static_name
+        self.env = self._create_env(bytecode_cache=True, bytecode_cache_dir=None, auto_reload=True)
+        self.app: FastAPI | None = None
+        # static 디렉터리 기준 경로('styles.css') -> URL('/static/styles.<hash>.css')
+        self.static_urls: Dict[str, str] = {}
+        self._route_urls: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], str] = {}
+        self.render_cache: AsyncTTLCache[RenderKey, bytes] = AsyncTTLCache(
+            "templates", self._render_key, maxsize=cache_size, ttl=cache_ttl,
+        )
+
+    def _create_env(self, bytecode_cache: bool, bytecode_cache_dir: str | None, auto_reload: bool) -> jinja2.Environment:
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(self.directory),
+            autoescape=True,
+            enable_async=True,
+            # bytecode_cache_dir가 None이면 임시 디렉터리 아래 사용자별 폴더(워커끼리 공유)
+            bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache else None,
+            # False면 요청마다 템플릿 파일 수정 시각을 확인(stat)하지 않음
+            auto_reload=auto_reload,
+        )
+        env.globals["url_for"] = self.url_for
+        return env
+
+    def configure(
+        self,
+        bytecode_cache: bool = True,
+        bytecode_cache_dir: str | None = None,
+        auto_reload: bool = True,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+    ) -> None:
+        # create_app에서 Setting 값으로 조정, 환경을 새로 만들므로 렌더 결과 캐시도 비움
+        if bytecode_cache_dir is not None:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+        self.env = self._create_env(bytecode_cache, bytecode_cache_dir, auto_reload)
+        self.render_cache.configure(maxsize=cache_size, ttl=cache_ttl)
+
+    def bind(self, app: FastAPI) -> None:
+        # 라우트/마운트가 모두 등록된 뒤 호출, 정적 파일 URL 미리 계산
+        self.app = app
+        self._route_urls.clear()
+        self.static_urls = {
+            relative: str(app.url_path_for(self.static_name, path=f"/{served}"))
+            for relative, served in self._static_names(app).items()
+        }
+        self.render_cache.invalidate()
+
+    def _static_names(self, app: FastAPI) -> Dict[str, str]:
+        # static 기준 경로 -> 실제로 요청할 경로, 마운트가 해시 이름을 제공하면(core.static.HashedStaticFiles) 해시 이름 사용
+        for route in app.routes:
+            if isinstance(route, Mount) and route.name == self.static_name and hasattr(route.app, "hashed_names"):
+                return route.app.hashed_names
+        names: Dict[str, str] = {}
+        if self.static_dir is not None:
+            for root, _, files in os.walk(self.static_dir):
+                for filename in files:
+                    relative = os.path.relpath(os.path.join(root, filename), self.static_dir).replace(os.sep, "/")
+                    names[relative] = relative
+        return names
+
+    def url_for(self, name: str, /, **path_params: Any) -> str:
+        # 템플릿의 url_for, Jinja2Templates와 달리 호스트를 포함하지 않는 경로를 반환
+        if self.app is None:
+            raise RuntimeError("TemplateRenderer.bind(app) must be called before rendering")
+        if name == self.static_name and set(path_params) == {"path"}:
+            url = self.static_urls.get(path_params["path"].lstrip("/"))
+            if url is not None:
+                return url
+        key = (name, tuple(sorted(path_params.items())))
+        url = self._route_urls.get(key)
+        if url is None:
+            # 라우트 목록을 훑는 비용은 (이름, 파라미터)마다 한 번, 개수가 무한히 늘지 않도록 상한
+            url = str(self.app.url_path_for(name, **path_params))
+            if len(self._route_urls) < 4096:
+                self._route_urls[key] = url
+        return url
+
+    def get_template(self, name: str) -> jinja2.Template:
+        return self.env.get_template(name)
+
+    async def render(self, name: str, context: Mapping[str, Any], cache: bool = False) -> bytes:
+        """템플릿을 렌더링해 UTF-8 bytes로 반환
+
+        cache=True면 (name, context) 조합별로 결과를 캐시한다. 컨텍스트 값은 hashable이어야 하며
+        결과가 컨텍스트만으로 정해져야 한다(request 같은 요청별 값은 넣지 않음).
+        """
+        if cache:
+            return await self.render_cache.get((name, tuple(sorted(context.items()))))
+        body = await self.get_template(name).render_async(context)
+        return body.encode("utf-8")
+
+    async def _render_key(self, key: RenderKey) -> bytes:
+        name, items = key
+        return await self.render(name, dict(items))
+
+    async def response(
+        self,
+        name: str,
+        context: Mapping[str, Any],
+        cache: bool = False,
+        status_code: int = 200,
+    ) -> HTMLResponse:
+        return HTMLResponse(await self.render(name, context, cache=cache), status_code=status_code)
+
+    def stream(self, name: str, context: Mapping[str, Any], status_code: int = 200) -> StreamingResponse:
+        # 렌더링되는 조각을 모아 일정 크기마다 전송, 큰 템플릿에서 첫 바이트까지의 시간과 메모리 사용량 감소
+        return StreamingResponse(
+            self._generate(name, context),
+            status_code=status_code,
+            media_type="text/html; charset=utf-8",
+        )
+
+    async def _generate(self, name: str, context: Mapping[str, Any], chunk_size: int = 16 * 1024) -> AsyncIterator[bytes]:
+        # 템플릿 조각마다 전송하면 send 호출이 너무 많아지므로 chunk_size 단위로 묶음
+        buffer: list[str] = []
+        size = 0
+        async for piece in self.get_template(name).generate_async(context):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer.clear()
+                size = 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
@@ -0,0 +1,200 @@
+# 라우트(경로 템플릿)별 지연 시간 히스토그램 수집 미들웨어
+# 단계
+#   routing_validation: 요청 수신 ~ 엔드포인트 호출 직전(미들웨어, 라우팅, 파라미터 검증, 의존성)
+#   handler: 엔드포인트 실행
+#   serialization: 엔드포인트 반환 ~ http.response.start(응답 렌더링, 압축 등 응답을 가공하는 미들웨어 포함)
+#   send: http.response.start ~ 마지막 본문 전송(스트리밍 응답은 생성 시간 포함)
+import bisect
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ms 단위 버킷 상한, 마지막 버킷은 그 이상 전부
+BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+PHASES: Tuple[str, ...] = ("routing_validation", "handler", "serialization", "send", "total")
+
+
+@dataclass
+class RequestTiming:
+    start: float
+    handler_start: float | None = None
+    handler_end: float | None = None
+    response_start: float | None = None
+    end: float | None = None
+
+    def phases(self) -> Dict[str, float]:
+        # 초 단위, handler 표시가 없는 라우트(FastJSONRoute가 아닌 라우트)는 total/send만 기록
+        if self.end is None:
+            return {}
+        phases = {"total": self.end - self.start}
+        if self.response_start is not None:
+            phases["send"] = self.end - self.response_start
+            if self.handler_start is not None and self.handler_end is not None:
+                phases["routing_validation"] = self.handler_start - self.start
+                phases["handler"] = self.handler_end - self.handler_start
+                phases["serialization"] = self.response_start - self.handler_end
+        return phases
+
+
+# 현재 요청의 타이밍 기록, 스레드 풀에서 실행되는 동기 엔드포인트에도 컨텍스트가 복사되어 전달됨
+current_timing: ContextVar[RequestTiming | None] = ContextVar("current_timing", default=None)
+
+
+def mark_handler_start() -> None:
+    timing = current_timing.get()
+    if timing is not None:
+        timing.handler_start = time.perf_counter()
+
+
+def mark_handler_end() -> None:
+    timing = current_timing.get()
+    if timing is not None:
+        timing.handler_end = time.perf_counter()
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> float:
+        # 버킷 상한으로 근사, 마지막 버킷에 속하면 관측된 최대값 사용
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                (str(bound) if index < len(BUCKETS_MS) else "+Inf"): count
+                for index, (bound, count) in enumerate(zip((*BUCKETS_MS, None), self.counts))
+            },
+        }
+
+
+class TimingStore:
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, phases: Dict[str, float]) -> None:
+        with self._lock:
+            histograms = self._histograms.setdefault((method, route), {})
+            for phase, seconds in phases.items():
+                histograms.setdefault(phase, Histogram()).observe(seconds * 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                f"{method} {route}": {
+                    phase: histograms[phase].snapshot()
+                    for phase in PHASES if phase in histograms
+                }
+                for (method, route), histograms in sorted(self._histograms.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+timing_store: TimingStore = TimingStore()
+
+
+class TimingMiddleware:
+    """요청별 단계 시간을 측정해 경로 템플릿 단위로 집계
+
+    경로 템플릿은 라우팅 후 scope에 남는 endpoint로 찾는다(/l_fastapi/jinja2/1 -> /l_fastapi/jinja2/{id}).
+    """
+
+    def __init__(self, app: ASGIApp, store: TimingStore = timing_store) -> None:
+        self.app = app
+        self.store = store
+        self._templates: Dict[int, str] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(start=time.perf_counter())
+        token = current_timing.set(timing)
+
+        async def send_timed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing.response_start = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            timing.end = time.perf_counter()
+            current_timing.reset(token)
+            self.store.record(scope["method"], self.route_template(scope), timing.phases())
+
+    def route_template(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        if self._templates is None:
+            self._templates = self.build_templates(scope["app"].routes)
+        return self._templates.get(id(endpoint), "<unmatched>")
+
+    @staticmethod
+    def build_templates(routes: List[Any]) -> Dict[int, str]:
+        templates: Dict[int, str] = {}
+        for route in routes:
+            if isinstance(route, Mount):
+                templates.setdefault(id(route.app), route.path)
+            elif hasattr(route, "endpoint"):
+                templates.setdefault(id(route.endpoint), route.path)
+        return templates
+
+
+def timed_call(call: Callable[..., Any], is_coroutine: bool) -> Callable[..., Any]:
+    # 엔드포인트 실행 구간 표시, FastJSONRoute에서 dependant.call을 감쌀 때 사용
+    if is_coroutine:
+        @functools.wraps(call)
+        async def async_wrapper(**values: Any) -> Any:
+            mark_handler_start()
+            try:
+                return await call(**values)
+            finally:
+                mark_handler_end()
+        return async_wrapper
+
+    @functools.wraps(call)
+    def sync_wrapper(**values: Any) -> Any:
+        mark_handler_start()
+        try:
+            return call(**values)
+        finally:
+            mark_handler_end()
+    return sync_wrapper
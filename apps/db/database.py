@@ -0,0 +1,78 @@
+# 비동기 SQLAlchemy 엔진/세션 설정
+# 동기 엔진(sql_test.py)을 async 라우트에서 사용하면 쿼리 동안 이벤트 루프가 멈추므로 aiosqlite 기반 async 엔진 사용
+from typing import TYPE_CHECKING, Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from .models import Base
+
+if TYPE_CHECKING:
+    from ..config import Setting
+
+def engine_options(settings: "Setting") -> Dict[str, Any]:
+    options: Dict[str, Any] = {"echo": settings.db_echo, "query_cache_size": settings.db_query_cache_size}
+    if ":memory:" in settings.database_url:
+        # in-memory DB는 연결마다 별도 DB가 되므로 하나의 연결을 공유
+        options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=False,
+        )
+    return options
+
+# Setting.sqlite_profile에 따른 연결별 PRAGMA, in-memory DB와 SQLite가 아닌 DB에는 적용하지 않음
+def sqlite_pragmas(settings: "Setting") -> Dict[str, Any]:
+    if (
+        settings.sqlite_profile == "default"
+        or not settings.database_url.startswith("sqlite")
+        or ":memory:" in settings.database_url
+    ):
+        return {}
+    return {
+        # busy_timeout을 가장 먼저 설정해야 journal_mode 변경 중 잠금에 걸려도 대기함
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+    }
+
+# synchronous/mmap_size/cache_size/busy_timeout은 연결 단위 설정이므로 풀이 새 연결을 만들 때마다 적용
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: Dict[str, Any]) -> None:
+    if not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_engine_from_settings(settings: "Setting") -> AsyncEngine:
+    engine = create_async_engine(settings.database_url, **engine_options(settings))
+    apply_sqlite_pragmas(engine, sqlite_pragmas(settings))
+    return engine
+
+# expire_on_commit=False: commit 이후 속성 접근 시 다시 조회(암묵적 I/O)하지 않도록 설정
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+# 여러 워커가 동시에 시작하면 테이블 존재 확인과 생성 사이에 다른 워커가 먼저 만들 수 있으므로 한 번 더 시도
+async def create_tables(engine: AsyncEngine) -> None:
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except OperationalError as exc:
+        if "already exists" not in str(exc):
+            raise
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
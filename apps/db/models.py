@@ -0,0 +1,45 @@
+# ORM 모델 정의, sql_test.py의 4-1. Declaring Mapped Classes 예제와 같은 user_account/address 테이블
+# sql_test.py는 학습 기록(import 시 출력/엔진 생성)이므로 앱에서는 이 모듈을 사용
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, ForeignKey
+from sqlalchemy.orm import declarative_base, relationship
+
+Base = declarative_base()
+
+# server_default(CURRENT_TIMESTAMP)는 초 단위 문자열로 저장되어 파이썬에서 넣은 값과 형식이 달라지므로
+# 비교(keyset 페이지네이션)가 어긋나지 않도록 파이썬 쪽 기본값 사용, Core executemany에서도 행마다 호출됨
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class User(Base):
+    __tablename__ = "user_account"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(30), nullable=False)
+    fullname = Column(String)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    updated_at = Column(DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+    # 사용자 삭제 시 주소도 함께 삭제
+    # raise_on_sql: 미리 로딩하지 않은 관계에 접근할 때 쿼리를 실행하는 대신 예외 발생(N+1 방지)
+    # 관계가 필요한 조회는 user_service.user_loader_options로 로딩 방식을 지정
+    addresses = relationship(
+        "Address", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+
+    # keyset 페이지네이션(ORDER BY col, id / WHERE (col, id) > (?, ?))이 인덱스만 타도록 id까지 포함한 복합 인덱스
+    __table_args__ = (
+        Index("ix_user_account_created_at_id", "created_at", "id"),
+        Index("ix_user_account_updated_at_id", "updated_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"User(id={self.id!r}, name={self.name!r}, fullname={self.fullname!r})"
+
+class Address(Base):
+    __tablename__ = "address"
+    id = Column(Integer, primary_key=True)
+    email_address = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("user_account.id"))
+    user = relationship("User", back_populates="addresses", lazy="raise_on_sql")
+    def __repr__(self):
+        return f"Address(id={self.id!r}, email_address={self.email_address!r})"
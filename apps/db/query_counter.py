@@ -0,0 +1,93 @@
+# 요청/코드 블록 단위 SQL 실행 횟수 측정, 관계 로딩 누락으로 생기는 N+1 쿼리를 잡기 위해 사용
+# 엔진의 before_cursor_execute 이벤트에서 현재 컨텍스트(ContextVar)의 카운터를 증가
+# async 세션의 쿼리도 요청 task의 컨텍스트에서 실행되므로 동시 요청끼리 섞이지 않음
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator, List
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    def __init__(self, parent: "QueryCounter | None" = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.statements: List[str] = []
+
+    def record(self, statement: str) -> None:
+        # 바깥쪽 카운터에도 함께 기록(중첩된 count_queries)
+        counter: QueryCounter | None = self
+        while counter is not None:
+            counter.count += 1
+            counter.statements.append(statement)
+            counter = counter.parent
+
+
+class QueryBudgetExceeded(RuntimeError):
+    def __init__(self, name: str, expected: int, counter: QueryCounter) -> None:
+        super().__init__(
+            f"{name} executed {counter.count} queries (expected at most {expected}):\n"
+            + "\n".join(counter.statements)
+        )
+        self.expected = expected
+        self.count = counter.count
+
+
+current_counter: ContextVar[QueryCounter | None] = ContextVar("current_counter", default=None)
+
+
+def _count_query(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    counter = current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+def install_query_counter(engine: AsyncEngine) -> None:
+    # 카운터가 없는 컨텍스트에서는 ContextVar 조회 한 번만 추가됨
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _count_query):
+        event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """블록 안에서 실행된 SQL 수 측정
+
+    with count_queries() as counter:
+        await user_service.list_users(session, 100)
+    assert counter.count == 2
+    """
+    counter = QueryCounter(current_counter.get())
+    token = current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        current_counter.reset(token)
+
+
+def query_budget(expected: int) -> Callable[[Request], AsyncIterator[QueryCounter]]:
+    """라우트에서 허용하는 최대 쿼리 수, Depends(query_budget(n))로 사용
+
+    Setting.query_budget_mode
+      off: 검사하지 않음
+      warn: 초과 시 경고 로그
+      raise: 초과 시 QueryBudgetExceeded(테스트/개발 환경에서 N+1 회귀를 실패로 처리)
+    """
+    async def dependency(request: Request) -> AsyncIterator[QueryCounter]:
+        mode = request.app.state.settings.query_budget_mode
+        if mode == "off":
+            yield QueryCounter()
+            return
+        with count_queries() as counter:
+            yield counter
+        if counter.count > expected:
+            name = f"{request.method} {request.url.path}"
+            if mode == "raise":
+                raise QueryBudgetExceeded(name, expected, counter)
+            logger.warning("%s executed %d queries (expected at most %d)", name, counter.count, expected)
+
+    return dependency
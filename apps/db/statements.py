@@ -0,0 +1,137 @@
+# 자주 실행하는 User/Address 쿼리의 이름 붙은 문장 레지스트리
+# select(...)를 매번 조립하면 실행할 때마다 문장 트리를 순회해 캐시 키를 만들고(compiled cache 조회) 그 뒤에야 SQL을 재사용함
+# lambda_stmt는 람다의 코드 위치로 캐시 키를 만들고 클로저 변수만 바인드 파라미터로 추출하므로 이 순회를 건너뜀
+# 실행 결과는 이름별로 실행 횟수, compiled cache hit/miss, 실행 시간을 집계(/_statements 에서 조회)
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Literal
+
+from sqlalchemy import Executable, event, func, lambda_stmt, select
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from .models import Address, User
+
+@dataclass
+class StatementStats:
+    executions: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # 캐시를 쓰지 않은 실행(캐시 비활성화, 캐시 키 없음 등)
+    uncached: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "uncached": self.uncached,
+            "mean_ms": self.total_ms / self.executions if self.executions else 0.0,
+            "max_ms": self.max_ms,
+        }
+
+
+@dataclass
+class _Execution:
+    # 한 번의 registry.execute 동안 첫 번째 cursor 실행의 캐시 결과
+    # selectinload 등 ORM이 이어서 실행하는 보조 쿼리는 집계하지 않음
+    cache_hit: Any = None
+
+
+_current_execution: ContextVar[_Execution | None] = ContextVar("_current_execution", default=None)
+
+
+def _record_cache_hit(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    execution = _current_execution.get()
+    if execution is not None and execution.cache_hit is None:
+        execution.cache_hit = context.cache_hit
+
+
+class StatementRegistry:
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[..., Executable]] = {}
+        self._stats: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str) -> Callable[[Callable[..., Executable]], Callable[..., Executable]]:
+        # 파라미터를 받아 lambda_stmt를 돌려주는 함수를 이름으로 등록
+        def decorator(factory: Callable[..., Executable]) -> Callable[..., Executable]:
+            if name in self._factories:
+                raise ValueError(f"Statement {name!r} is already registered")
+            self._factories[name] = factory
+            self._stats[name] = StatementStats()
+            return factory
+        return decorator
+
+    def install(self, engine: AsyncEngine) -> None:
+        if not event.contains(engine.sync_engine, "after_cursor_execute", _record_cache_hit):
+            event.listen(engine.sync_engine, "after_cursor_execute", _record_cache_hit)
+
+    async def execute(self, session: AsyncSession, name: str, **params: Any) -> Any:
+        stmt = self._factories[name](**params)
+        execution = _Execution()
+        token = _current_execution.set(execution)
+        start = time.perf_counter()
+        try:
+            return await session.execute(stmt)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _current_execution.reset(token)
+            self._record(name, execution.cache_hit, elapsed_ms)
+
+    def _record(self, name: str, cache_hit: Any, elapsed_ms: float) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats.executions += 1
+            if cache_hit is CACHE_HIT:
+                stats.cache_hits += 1
+            elif cache_hit is CACHE_MISS:
+                stats.cache_misses += 1
+            else:
+                stats.uncached += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in sorted(self._stats.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = StatementStats()
+
+
+statements: StatementRegistry = StatementRegistry()
+
+# user_service.LoaderStrategy별 관계 로딩 옵션, 람다마다 코드 위치가 고정이라 각각 별도 캐시 키가 됨
+_USER_LOADERS: Dict[str, Callable[[Any], Any]] = {
+    "selectin": lambda s: s.options(selectinload(User.addresses)),
+    "joined": lambda s: s.options(joinedload(User.addresses)),
+    "raise": lambda s: s.options(raiseload(User.addresses)),
+}
+
+
+@statements.register("user.get_by_id")
+def user_get_by_id(user_id: int, loader: Literal["selectin", "joined", "raise"] = "selectin") -> StatementLambdaElement:
+    stmt = lambda_stmt(lambda: select(User).where(User.id == user_id))
+    stmt += _USER_LOADERS[loader]
+    return stmt
+
+
+@statements.register("address.list_by_user")
+def address_list_by_user(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Address).where(Address.user_id == user_id).order_by(Address.id)
+    )
+
+
+@statements.register("user.count")
+def user_count() -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(func.count()).select_from(User))
@@ -1,10 +1,11 @@
 # FastAPI 프레임워크 기본 정의
 from fastapi import FastAPI
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, ORJSONResponse
 from functools import lru_cache
 from .config import Setting, create_app
-
-app: FastAPI = create_app()
+from .core.timing import timing_store
+from .db.statements import statements
+from .service.cache import caches
 
 # lru_cache decorator: Python 내장 데코레이터, 함수 결과를 캐시, 이미 캐시되어 있다면 함수를 실행하지 않고 캐시 결과 반환
 # .env로 환경변수를 주입하는 과정에서 파일을 읽는 비용을 최적화하기 위해 사용
@@ -13,6 +14,8 @@ app: FastAPI = create_app()
 def get_settings() -> Setting:
     return Setting()
 
+app: FastAPI = create_app(get_settings())
+
 # include_in_schema=False 설정 시
 # 1. OpenAPI 스키마 생성 시간 단축
 # 2. 라우터 정보에 표시되지 않아 보안적 이점
@@ -24,6 +27,44 @@ def get_settings() -> Setting:
 async def health() -> PlainTextResponse:
     return 'ok'
 
+# 라우트(경로 템플릿)별 단계 지연 시간 히스토그램, 내부 확인용이므로 스키마에서 제외
+# ?reset=true 로 조회와 동시에 초기화
+@app.get(
+        "/_timing",
+        response_class=ORJSONResponse,
+        include_in_schema=False,
+)
+async def timing(reset: bool = False) -> ORJSONResponse:
+    snapshot = timing_store.snapshot()
+    if reset:
+        timing_store.reset()
+    return ORJSONResponse(snapshot)
+
+# db.statements 레지스트리에 등록된 문장별 실행 횟수, compiled cache hit/miss, 실행 시간
+@app.get(
+        "/_statements",
+        response_class=ORJSONResponse,
+        include_in_schema=False,
+)
+async def statement_stats(reset: bool = False) -> ORJSONResponse:
+    snapshot = statements.snapshot()
+    if reset:
+        statements.reset()
+    return ORJSONResponse(snapshot)
+
+# service.cache의 read-through 캐시별 크기와 hit ratio
+@app.get(
+        "/_caches",
+        response_class=ORJSONResponse,
+        include_in_schema=False,
+)
+async def cache_stats(reset: bool = False) -> ORJSONResponse:
+    snapshot = {name: cache.snapshot() for name, cache in caches.items()}
+    if reset:
+        for cache in caches.values():
+            cache.reset_stats()
+    return ORJSONResponse(snapshot)
+
 # 라우트 확인 로그
 print(f"Registered routes: {[route.path for route in app.routes]}")
 
@@ -0,0 +1,52 @@
+# 여러 작업을 한 요청으로 처리하는 batch 실행기
+# 같은 키(같은 대상)를 건드리는 작업은 요청 순서대로 실행하고, 서로 다른 키의 작업 묶음은 동시에 실행
+# 작업마다 task를 만들지 않고 concurrency개의 worker가 묶음을 차례로 가져가 실행(수천 개 작업에도 task 수 고정)
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def group_by_key(operations: Sequence[T], key: Callable[[T], Hashable | None]) -> List[List[int]]:
+    # key가 None이면 다른 작업과 독립적인 작업(혼자 한 묶음), 반환값은 원래 순서를 유지한 인덱스 묶음
+    groups: Dict[Hashable, List[int]] = {}
+    result: List[List[int]] = []
+    for index, operation in enumerate(operations):
+        group_key = key(operation)
+        if group_key is None:
+            result.append([index])
+            continue
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = []
+            result.append(group)
+        group.append(index)
+    return result
+
+
+async def run_grouped(
+    operations: Sequence[T],
+    key: Callable[[T], Hashable | None],
+    execute: Callable[[T], Awaitable[R]],
+    concurrency: int = 32,
+) -> List[R]:
+    """operations를 실행하고 결과를 입력 순서대로 반환
+
+    execute는 작업 하나의 결과(에러도 결과 값으로)를 돌려줘야 하며, 예외를 내면 batch 전체가 실패한다.
+    """
+    results: List[Any] = [None] * len(operations)
+    pending = iter(group_by_key(operations, key))
+
+    async def worker() -> None:
+        # 단일 스레드 이벤트 루프이므로 같은 iterator를 worker끼리 공유해도 안전
+        for group in pending:
+            for index in group:
+                results[index] = await execute(operations[index])
+
+    workers = min(concurrency, len(operations))
+    if workers <= 1:
+        await worker()
+    else:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
@@ -0,0 +1,163 @@
+# 비동기 read-through 캐시(LRU + TTL), 조회 함수(loader) 결과를 키 단위로 보관
+# - 같은 키에 대한 동시 miss는 loader를 한 번만 실행하고 결과를 공유(single-flight)
+# - 쓰기 시 invalidate로 제거, 그 키에 대해 진행 중이던 조회 결과는 저장하지 않음
+# - 워커(프로세스)마다 따로 존재하므로 다른 워커의 쓰기는 TTL이 지나야 반영됨
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # 다른 요청이 이미 조회 중이라 그 결과를 기다린 경우(loader 실행 없음)
+    coalesced: int = 0
+    load_errors: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            **self.__dict__,
+            # coalesced도 loader를 실행하지 않았으므로 hit로 계산
+            "hit_ratio": (self.hits + self.coalesced) / requests if requests else 0.0,
+        }
+
+
+class AsyncTTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[K], Awaitable[V]],
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+    ) -> None:
+        self.name = name
+        self.loader = loader
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        # key -> (만료 시각, 값)
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        # 키별 진행 중인 조회, 키의 세대(generation) 역할도 함
+        # invalidate(key)는 그 키의 task만 목록에서 빼므로, 끝났을 때 자신이 아직 등록된 task인 조회만 결과를 저장
+        # (다른 키의 무효화는 진행 중인 조회에 영향 없음)
+        self._inflight: Dict[K, "asyncio.Task[V]"] = {}
+        caches[name] = self
+
+    def configure(self, maxsize: int | None = None, ttl: float | None = None) -> None:
+        # create_app에서 Setting 값으로 조정, 기존 항목은 비움
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        self.invalidate()
+
+    async def get(self, key: K) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.stats.expirations += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            # 요청한 쪽이 취소되어도 조회는 끝까지 진행되도록 별도 task로 실행하고 shield로 기다림
+            task = asyncio.ensure_future(self._load(key))
+            # 기다리던 요청이 모두 취소된 뒤 실패해도 "exception was never retrieved" 경고가 나지 않도록 조회
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: K) -> V:
+        current = True
+        try:
+            value = await self.loader(key)
+        except BaseException:
+            self.stats.load_errors += 1
+            raise
+        finally:
+            # 조회 중 이 키가 무효화되었으면 이미 목록에서 빠져 있음
+            current = self._inflight.get(key) is asyncio.current_task()
+            if current:
+                del self._inflight[key]
+        if current and self.maxsize > 0 and self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return value
+
+    def invalidate(self, key: K | None = None) -> None:
+        # key가 None이면 전체 제거, 진행 중인 조회는 결과를 반환하지만 저장하지 않음
+        self.stats.invalidations += 1
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            **self.stats.snapshot(),
+        }
+
+    def reset_stats(self) -> None:
+        self.stats = CacheStats()
+
+
+# 이름별 캐시 목록, /_caches 에서 조회
+caches: Dict[str, AsyncTTLCache] = {}
+
+
+def cached_dependency(
+    cache: AsyncTTLCache,
+    *key_params: str,
+    annotation: Any = str,
+    key: Callable[..., Hashable] | None = None,
+) -> Callable[..., Awaitable[Any]]:
+    """캐시 조회를 FastAPI 의존성으로 사용
+
+    key_params 이름의 경로/쿼리 파라미터 값으로 키를 만든다(하나면 그 값, 여러 개면 튜플, key 함수가 있으면 key(*values)).
+    loader가 KeyError를 내면 404 응답(실패 결과는 캐시하지 않음).
+
+    ItemDep = Annotated[dict, Depends(cached_dependency(item_cache, "item_id"))]
+    """
+    async def dependency(**params: Any) -> Any:
+        values = tuple(params[name] for name in key_params)
+        if key is not None:
+            cache_key = key(*values)
+        else:
+            cache_key = values[0] if len(values) == 1 else values
+        try:
+            return await cache.get(cache_key)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Not found")
+
+    dependency.__signature__ = inspect.Signature([  # type: ignore[attr-defined]
+        inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+        for name in key_params
+    ])
+    return dependency
@@ -0,0 +1,179 @@
+# 사용자 데이터셋의 컬럼(배열) 표현, 집계 전용
+# dict 목록은 사용자마다 dict/문자열/float 객체를 따로 가지고 있어 크고, 합계 하나에도 모든 dict를 훑어야 함
+# 여기서는 필드별로 array 모듈의 연속 배열(8바이트 float, 1바이트 bool 등)에 담아 두고 집계
+# - 필터 조합(is_active 3가지 x language 종류+1)이 적으므로 조합별 정렬된 balance 배열/합계와 언어별 개수를 생성 시 계산
+#   -> 요청마다 사용자 전체를 훑지 않음(numpy 없이 조회/백분위수 보간만)
+# - 범주형 값(language)은 코드(0..n-1) 1바이트 배열 + 코드표
+# - 거래(transactions)는 사용자별 중첩 목록을 펼쳐서 날짜순 (날짜, 사용자 위치, 금액) 컬럼으로 보관
+# - 원본 dict 목록은 컬럼을 만드는 동안만 사용하고 참조를 남기지 않음(ColumnarCache는 캐시되지 않는 build 함수로 생성)
+import bisect
+import math
+import threading
+from array import array
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Literal, Sequence, Tuple
+
+User = Dict[str, Any]
+Bucket = Literal["day", "week", "month"]
+# (is_active, language) 필터 조합, None은 조건 없음
+GroupKey = Tuple[bool | None, str | None]
+
+
+def _ordinal(timestamp: str) -> int:
+    # "2025-03-01T12:00:00Z" -> 날짜 ordinal(일 단위)
+    return date.fromisoformat(timestamp[:10]).toordinal()
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    # numpy.percentile 기본값(linear)과 같은 보간
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * percent / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class ColumnarUsers:
+    def __init__(self, users: Sequence[User]) -> None:
+        self.size = len(users)
+        self.ids = array("q", (user["id"] for user in users))
+        self.balance = array("d", (user["balance"] for user in users))
+        self.is_active = array("B", (user["is_active"] for user in users))
+        self.languages: List[str] = sorted({user["settings"]["language"] for user in users})
+        codes = {language: code for code, language in enumerate(self.languages)}
+        self.language = array("B", (codes[user["settings"]["language"]] for user in users))
+
+        # 거래는 날짜순으로 정렬해 두어 날짜 버킷이 연속 구간(slice)이 되도록 함
+        transactions = sorted(
+            (_ordinal(transaction["date"]), position, transaction["amount"])
+            for position, user in enumerate(users)
+            for transaction in user["transactions"]
+        )
+        self.tx_day = array("i", (entry[0] for entry in transactions))
+        self.tx_user = array("i", (entry[1] for entry in transactions))
+        self.tx_amount = array("d", (entry[2] for entry in transactions))
+
+        # 필터 조합별 정렬된 balance와 합계(사용자는 조건 유무 조합 4개 그룹에 속함)
+        groups: Dict[GroupKey, List[float]] = {}
+        for value, active, user in zip(self.balance, self.is_active, users):
+            language = user["settings"]["language"]
+            for active_key in (None, bool(active)):
+                for language_key in (None, language):
+                    groups.setdefault((active_key, language_key), []).append(value)
+        self.balance_groups: Dict[GroupKey, Tuple[array, float]] = {
+            key: (array("d", sorted(values)), math.fsum(values)) for key, values in groups.items()
+        }
+        # is_active 조건(None/True/False)별 언어 개수
+        self.language_count: Dict[bool | None, Dict[str, int]] = {
+            active: {
+                language: len(self.balance_groups.get((active, language), ((), 0.0))[0])
+                for language in self.languages
+            }
+            for active in (None, True, False)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        # 컬럼 버퍼 크기 합(코드표 제외)
+        columns = (
+            self.ids, self.balance, self.is_active, self.language,
+            self.tx_user, self.tx_amount, self.tx_day,
+            *(values for values, _ in self.balance_groups.values()),
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def balance_stats(
+        self,
+        percentiles: Sequence[float] = (50, 90, 99),
+        is_active: bool | None = None,
+        language: str | None = None,
+    ) -> Dict[str, Any]:
+        if language is not None and language not in self.languages:
+            raise ValueError(f"Unknown language {language!r}")
+        values, total = self.balance_groups.get((is_active, language), (array("d"), 0.0))
+        count = len(values)
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else None,
+            "min": values[0] if count else None,
+            "max": values[-1] if count else None,
+            # JSON에 nan을 넣지 않도록 빈 결과면 None
+            "percentiles": {
+                f"{percent:g}": (_percentile(values, percent) if count else None) for percent in percentiles
+            },
+        }
+
+    def language_counts(self, is_active: bool | None = None) -> Dict[str, int]:
+        return dict(self.language_count[is_active])
+
+    def _bucket_starts(self, bucket: Bucket) -> List[int]:
+        # 거래 날짜 범위의 버킷 시작 ordinal 목록(오름차순)
+        if not self.tx_day:
+            return []
+        first, last = self.tx_day[0], self.tx_day[-1]
+        if bucket == "day":
+            return list(range(first, last + 1))
+        if bucket == "week":
+            # 월요일 시작
+            start = first - date.fromordinal(first).weekday()
+            return list(range(start, last + 1, 7))
+        starts = []
+        current = date.fromordinal(first).replace(day=1)
+        while current.toordinal() <= last:
+            starts.append(current.toordinal())
+            current = (current + timedelta(days=32)).replace(day=1)
+        return starts
+
+    def transaction_totals(self, bucket: Bucket = "month") -> List[Dict[str, Any]]:
+        # 날짜 버킷별 거래 수/합계, 거래가 없는 버킷은 제외
+        # 거래가 날짜순이므로 버킷 경계를 bisect로 찾고 구간 합계만 계산
+        starts = self._bucket_starts(bucket)
+        bounds = [bisect.bisect_left(self.tx_day, start) for start in starts] + [len(self.tx_day)]
+        # YYYY-MM(month) 또는 YYYY-MM-DD(day, week)
+        label_size = 7 if bucket == "month" else 10
+        result = []
+        for start, low, high in zip(starts, bounds, bounds[1:]):
+            if high > low:
+                result.append({
+                    "bucket": date.fromordinal(start).isoformat()[:label_size],
+                    "count": high - low,
+                    "total": round(math.fsum(self.tx_amount[low:high]), 2),
+                })
+        return result
+
+
+class ColumnarCache:
+    # 데이터셋 버전(생성 코드/seed 등으로 만든 키)별 컬럼 표현, 키가 바뀌면 새로 만듦
+    def __init__(self) -> None:
+        self._key: Hashable | None = None
+        self._store: ColumnarUsers | None = None
+        self._lock = threading.Lock()
+
+    def peek(self, key: Hashable) -> ColumnarUsers | None:
+        store = self._store
+        return store if store is not None and self._key == key else None
+
+    def get(self, key: Hashable, load: Callable[[], Sequence[User]]) -> ColumnarUsers:
+        """key의 컬럼 표현, 없으면 load()로 받은 사용자 목록에서 생성
+
+        load는 메모이즈되지 않은 데이터셋을 반환해야 한다(컬럼을 만든 뒤 dict 목록은 해제됨).
+        생성은 블로킹이므로 async 라우트에서는 스레드 풀에서 호출한다.
+        """
+        store = self.peek(key)
+        if store is not None:
+            return store
+        with self._lock:
+            if self._store is None or self._key != key:
+                self._store = ColumnarUsers(load())
+                self._key = key
+            return self._store
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._store = None
+
+
+columnar_users: ColumnarCache = ColumnarCache()
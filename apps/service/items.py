@@ -0,0 +1,49 @@
+# response_model 예제 라우트(exc_unset/include/exclude)가 사용하는 아이템 저장소
+# 지금은 메모리 dict지만 DB로 바뀌어도 라우트는 item_cache(read-through)를 통해서만 조회하므로 요청마다 쿼리하지 않음
+import copy
+from typing import Any, Dict, Tuple
+
+from .cache import AsyncTTLCache
+
+# 테이블 이름 -> {item_id: item}
+# response_model_exclude_unset 예제를 위해 값이 없는 필드는 키 자체를 넣지 않음
+ITEM_TABLES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "first": {
+        "foo": {"name": "Foo", "price": 50.2},
+        "bar": {"name": "Bar", "description": "The bartenders", "price": 62, "tax": 20.2},
+        "baz": {"name": "Baz", "description": None, "price": 50.2, "tax": 10.5, "tags": []},
+    },
+    "second": {
+        "foo": {"name": "Foo", "price": 50.2},
+        "bar": {"name": "Bar", "description": "The Bar fighters", "price": 62, "tax": 20.2},
+        "baz": {
+            "name": "Baz",
+            "description": "There goes my baz",
+            "price": 50.2,
+            "tax": 10.5,
+        },
+    },
+}
+
+ItemKey = Tuple[str, str]
+
+
+async def load_item(key: ItemKey) -> Dict[str, Any]:
+    # 없는 아이템은 KeyError, 캐시에 저장된 dict를 호출한 쪽이 수정해도 원본에 영향이 없도록 복사
+    table, item_id = key
+    return copy.deepcopy(ITEM_TABLES[table][item_id])
+
+
+item_cache: AsyncTTLCache[ItemKey, Dict[str, Any]] = AsyncTTLCache("items", load_item)
+
+
+async def save_item(table: str, item_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    # 전달된 필드만 저장(exclude_unset 결과), 저장 후 캐시 무효화
+    ITEM_TABLES[table][item_id] = dict(values)
+    item_cache.invalidate((table, item_id))
+    return values
+
+
+async def delete_item(table: str, item_id: str) -> None:
+    del ITEM_TABLES[table][item_id]
+    item_cache.invalidate((table, item_id))
@@ -0,0 +1,113 @@
+# keyset(cursor) 페이지네이션
+# offset은 앞의 행을 모두 건너뛰어야 하므로 깊은 페이지일수록 느려짐
+# cursor는 마지막으로 본 (order_by 값, id)를 담고 다음 페이지는 그 뒤에서 바로 시작 -> 첫 페이지와 같은 비용
+import base64
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import orjson
+
+KeysetKey = Tuple[Any, int]
+
+
+def encode_cursor(order_by: str, value: Any, row_id: int) -> str:
+    # 클라이언트에게는 불투명한 문자열, 정렬 기준이 바뀐 cursor를 구분하기 위해 order_by도 포함
+    raw = orjson.dumps([order_by, value, row_id])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, order_by: str) -> KeysetKey:
+    # 형식이 잘못되었거나 다른 order_by로 만든 cursor면 ValueError
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order_by, value, row_id = orjson.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if cursor_order_by != order_by:
+        raise ValueError(f"Cursor was issued for order_by={cursor_order_by!r}")
+    if not isinstance(row_id, int):
+        raise ValueError("Malformed cursor")
+    return value, row_id
+
+
+class KeysetIndex:
+    """메모리 컬렉션을 (key, id) 순서로 정렬해 둔 인덱스
+
+    한 번 정렬해 두면 cursor 위치는 bisect(O(log n))로 찾고 limit개만 잘라서 반환한다.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any]) -> None:
+        self.items = items
+        decorated = sorted(((key(item), item["id"]), index) for index, item in enumerate(items))
+        self.keys: List[KeysetKey] = [entry[0] for entry in decorated]
+        self.order: List[int] = [entry[1] for entry in decorated]
+
+    def page(
+        self,
+        limit: int,
+        after: KeysetKey | None = None,
+        offset: int = 0,
+        predicate: Callable[[Dict[str, Any]], bool] | None = None,
+    ) -> Tuple[List[Dict[str, Any]], KeysetKey | None]:
+        # 반환: (페이지 항목, 다음 페이지가 있으면 마지막 항목의 key)
+        try:
+            position = bisect.bisect_right(self.keys, after) if after is not None else offset
+        except TypeError as exc:
+            # cursor 값의 타입이 정렬 key와 다른 경우
+            raise ValueError("Malformed cursor") from exc
+        result: List[Dict[str, Any]] = []
+        last = position
+        # predicate가 있으면 조건에 맞는 항목을 limit개 찾을 때까지 앞으로 진행
+        while last < len(self.order) and len(result) < limit:
+            item = self.items[self.order[last]]
+            if predicate is None or predicate(item):
+                result.append(item)
+            last += 1
+        if not result or last >= len(self.order):
+            return result, None
+        return result, self.keys[last - 1]
+
+
+class KeysetIndexCache:
+    # (컬렉션, 정렬 기준)별 인덱스 LRU
+    # 컬렉션 객체를 인덱스가 참조하므로 캐시에 있는 동안 id()가 재사용되지 않음
+    def __init__(self, maxsize: int = 8) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, str], KeysetIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, items: Sequence[Dict[str, Any]], order_by: str) -> KeysetIndex | None:
+        # 이미 만든 인덱스만 반환, 없으면 None(async 라우트는 생성을 스레드 풀에서 실행)
+        cache_key = (id(items), order_by)
+        with self._lock:
+            index = self._entries.get(cache_key)
+            if index is not None and index.items is items:
+                self._entries.move_to_end(cache_key)
+                return index
+        return None
+
+    def get(
+        self,
+        items: Sequence[Dict[str, Any]],
+        order_by: str,
+        key: Callable[[Dict[str, Any]], Any],
+    ) -> KeysetIndex:
+        index = self.peek(items, order_by)
+        if index is not None:
+            return index
+        cache_key = (id(items), order_by)
+        index = KeysetIndex(items, key)
+        with self._lock:
+            self._entries[cache_key] = index
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+keyset_indexes: KeysetIndexCache = KeysetIndexCache()
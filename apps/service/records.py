@@ -0,0 +1,123 @@
+# test_json_orjson 데이터셋의 사용자 레코드 타입(__slots__ dataclass)
+# dict는 인스턴스마다 해시 테이블을 따로 가지므로 필드가 적은 중첩 객체(settings, preferences, transaction 등)일수록 낭비가 큼
+# slots dataclass는 필드를 고정 크기 슬롯에 저장(인스턴스 __dict__ 없음), friends 같은 목록은 tuple로 보관
+# orjson이 dataclass를 직접 직렬화하므로(필드 선언 순서대로) dict 표현과 같은 JSON bytes가 나옴
+# 단, orjson은 __dict__가 없는 slots 인스턴스를 필드마다 getattr로 읽어서 dict보다 직렬화가 느림
+# -> 오래 들고 있는 데이터셋의 메모리를 줄이는 용도, 응답은 response_cache로 직렬화 결과를 캐시해서 사용(apps.bench.records)
+#
+# msgspec.Struct도 같은 목적이지만 requirements에 없으므로 표준 라이브러리 dataclass 사용
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from .test_json_orjson import DEFAULT_SEED, build_test_data, build_test_data_v2
+
+
+@dataclass(slots=True)
+class Preferences:
+    emails: bool
+    sms: bool
+    push: bool
+
+
+@dataclass(slots=True)
+class Settings:
+    theme: str
+    notifications: bool
+    language: str
+    preferences: Preferences
+
+
+@dataclass(slots=True)
+class Transaction:
+    date: str
+    amount: float
+    description: str
+
+
+@dataclass(slots=True)
+class Metadata:
+    created_at: str
+    updated_at: str
+    tags: Tuple[str, ...]
+
+
+@dataclass(slots=True)
+class User:
+    # test_data(v1) 사용자
+    id: int
+    name: str
+    email: str
+    is_active: bool
+    balance: float
+    bio: str
+    friends: Tuple[int, ...]
+    settings: Settings
+    transactions: Tuple[Transaction, ...]
+    metadata: Metadata
+
+
+@dataclass(slots=True)
+class SettingsV2:
+    theme: str
+    notifications: bool
+    language: str
+
+
+@dataclass(slots=True)
+class UserV2:
+    # test_data_v2 사용자, v1보다 필드가 적음(is_active, balance, metadata, settings.preferences 없음)
+    id: int
+    name: str
+    email: str
+    bio: str
+    friends: Tuple[int, ...]
+    settings: SettingsV2
+    transactions: Tuple[Transaction, ...]
+
+
+def user_from_dict(user: Dict[str, Any]) -> User:
+    settings = user["settings"]
+    metadata = user["metadata"]
+    return User(
+        id=user["id"],
+        name=user["name"],
+        email=user["email"],
+        is_active=user["is_active"],
+        balance=user["balance"],
+        bio=user["bio"],
+        friends=tuple(user["friends"]),
+        settings=Settings(
+            theme=settings["theme"],
+            notifications=settings["notifications"],
+            language=settings["language"],
+            preferences=Preferences(**settings["preferences"]),
+        ),
+        transactions=tuple(Transaction(**transaction) for transaction in user["transactions"]),
+        metadata=Metadata(
+            created_at=metadata["created_at"],
+            updated_at=metadata["updated_at"],
+            tags=tuple(metadata["tags"]),
+        ),
+    )
+
+
+def user_v2_from_dict(user: Dict[str, Any]) -> UserV2:
+    return UserV2(
+        id=user["id"],
+        name=user["name"],
+        email=user["email"],
+        bio=user["bio"],
+        friends=tuple(user["friends"]),
+        settings=SettingsV2(**user["settings"]),
+        transactions=tuple(Transaction(**transaction) for transaction in user["transactions"]),
+    )
+
+
+def build_test_records(user_count: int = 1000, seed: int = DEFAULT_SEED, **options: Any) -> Dict[str, Any]:
+    # test_data와 같은 구조, users만 레코드 목록(summary/config는 작으므로 dict 그대로)
+    # 사용자 dict는 만들 때마다 바로 변환하므로 dict 목록 전체가 동시에 메모리에 올라가지 않음
+    return build_test_data(user_count, seed=seed, convert=user_from_dict, **options)
+
+
+def build_test_records_v2(user_count: int = 1800, seed: int = DEFAULT_SEED, **options: Any) -> Dict[str, Any]:
+    return build_test_data_v2(user_count, seed=seed, convert=user_v2_from_dict, **options)
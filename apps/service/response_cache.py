@@ -0,0 +1,378 @@
+# 불변 페이로드를 인코더별로 한 번만 직렬화해 두고 bytes 그대로 응답하는 캐시
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import orjson
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..core.compression import representation_etag
+from .shared_dataset import SharedStore, shared_store
+from .snapshot import FORMAT_VERSION as SNAPSHOT_FORMAT_VERSION
+from .snapshot import Snapshot, build_snapshot
+
+
+# starlette JSONResponse.render와 같은 옵션, 캐시 유무에 따라 응답 바이트가 달라지지 않도록 맞춤
+def encode_json(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+# fastapi ORJSONResponse.render와 같은 옵션
+def encode_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "json": encode_json,
+    "orjson": encode_orjson,
+}
+
+
+@dataclass
+class CachedPayload:
+    # 공유 파일(shared_dataset)에서 읽은 경우 mmap을 가리키는 memoryview(복사 없음)
+    body: bytes | memoryview
+    etag: str
+    media_type: str = "application/json"
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.created_at, usegmt=True),
+        }
+
+    def to_response(self, status_code: int = 200) -> Response:
+        # bytes를 그대로 넘기면 Response.render에서 복사/재인코딩 없이 전송
+        return Response(
+            content=self.body,
+            status_code=status_code,
+            media_type=self.media_type,
+            headers=self.headers,
+        )
+
+
+# 본문 해시 기반의 strong ETag, 같은 바이트면 워커가 달라도 같은 값
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+# If-None-Match는 weak 비교(W/ 접두어 무시), 압축 등으로 weak 처리된 ETag도 일치로 판단
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+# If-Modified-Since 비교, HTTP 날짜는 초 단위이므로 소수점 이하는 버림
+def not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+# RFC 9110 13.2.2: If-None-Match가 있으면 If-Modified-Since는 무시
+def is_not_modified(request: Request, etag: str | None, last_modified: float | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        return not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+# 본문 없이 검증자 헤더만 담은 304 응답, 아직 직렬화 전이면 Last-Modified만 전달
+# ETag는 같은 요청의 200 응답과 같은 형식(압축되면 weak)
+def not_modified_response(
+    payload: CachedPayload | None, last_modified: float | None, request: Request | None = None,
+) -> Response:
+    if payload is not None:
+        headers = payload.headers
+        if request is not None:
+            headers["ETag"] = representation_etag(request.scope, payload.etag, payload.media_type, len(payload.body))
+    else:
+        headers = {"Last-Modified": formatdate(last_modified, usegmt=True)}
+    return Response(status_code=304, headers=headers)
+
+
+@dataclass
+class SharedSource:
+    key: str
+    loader: Callable[[], Any]
+    # 데이터 생성 코드 버전(shared_dataset.source_version)
+    version: str
+    store: SharedStore
+    list_key: str
+
+    def name(self, encoder: str) -> str:
+        return f"{self.key}.{encoder}"
+
+    def file_version(self, generation: int) -> str:
+        # 스냅샷 형식이나 세대(invalidate)가 바뀌어도 다른 파일을 사용
+        return f"{self.version}-s{SNAPSHOT_FORMAT_VERSION}-g{generation}"
+
+
+class ResponseCache:
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], CachedPayload] = {}
+        # 키별 원본 데이터의 변경 시각, 인코더별 직렬화 전에도 If-Modified-Since 판단에 사용
+        self._modified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str | None], None]] = []
+        # 워커 간 공유 스냅샷 파일로 직렬화 결과를 만드는 키
+        self._shared: Dict[str, SharedSource] = {}
+        self._snapshots: Dict[Tuple[str, str], Snapshot] = {}
+        # 공유 키 -> 이 워커가 사용 중인 (세대 파일 token, 세대)
+        self._generations: Dict[str, Tuple[Tuple[int, int] | None, int]] = {}
+
+    def get(self, key: str, encoder: str) -> CachedPayload | None:
+        if key in self._shared:
+            self._sync_shared(key)
+        return self._entries.get((key, encoder))
+
+    def put(self, key: str, encoder: str, content: Any) -> CachedPayload:
+        body = ENCODERS[encoder](content)
+        with self._lock:
+            modified = self._modified.setdefault(key, time.time())
+        payload = CachedPayload(body=body, etag=make_etag(body), created_at=modified)
+        with self._lock:
+            # 동시에 같은 키를 채운 경우 먼저 저장된 값을 유지, ETag가 흔들리지 않도록
+            return self._entries.setdefault((key, encoder), payload)
+
+    def get_or_build(self, key: str, encoder: str, loader: Callable[[], Any]) -> CachedPayload:
+        payload = self.get(key, encoder)
+        if payload is None:
+            payload = self.put(key, encoder, loader())
+        return payload
+
+    def share(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        version: str,
+        store: SharedStore = shared_store,
+        list_key: str = "users",
+    ) -> None:
+        """key의 직렬화 결과를 워커 간 공유 스냅샷 파일(shared_dataset + snapshot)로 만들도록 등록
+
+        처음 필요해진 워커 하나만 loader()를 실행해 인코더별 파일을 만들고, 나머지 워커는 그 파일을 mmap으로 연다.
+        loader 결과는 엔드포인트 반환값과 같아야 한다(cached_response는 엔드포인트 대신 loader를 사용).
+        스냅샷에는 loader()[list_key] 항목별 위치 인덱스가 함께 저장된다(snapshot(key, encoder).item(id)).
+        """
+        self._shared[key] = SharedSource(key, loader, version, store, list_key)
+
+    def is_shared(self, key: str) -> bool:
+        shared = self._shared.get(key)
+        return shared is not None and shared.store.enabled
+
+    def get_snapshot(self, key: str, encoder: str) -> Snapshot | None:
+        self._sync_shared(key)
+        return self._snapshots.get((key, encoder))
+
+    def _sync_shared(self, key: str) -> None:
+        # 다른 워커가 invalidate해서 세대 파일이 바뀌었으면 이 워커의 캐시/매핑을 버림 -> 다음 조회에서 새 세대를 로드
+        # 요청마다 stat 한 번, 워커끼리 같은 URL에 다른 본문/ETag를 응답하지 않도록 함
+        loaded = self._generations.get(key)
+        if loaded is None:
+            return
+        source = self._shared[key]
+        if source.store.enabled and source.store.generation_token(key) != loaded[0]:
+            self._discard(key)
+            for listener in self._listeners:
+                listener(key)
+
+    def _shared_generation(self, key: str) -> int:
+        # 이 워커가 사용할 세대, 처음 로드할 때 세대 파일에서 읽어서 고정
+        loaded = self._generations.get(key)
+        if loaded is None:
+            store = self._shared[key].store
+            # token을 먼저 읽음, 사이에 세대가 바뀌면 다음 확인 때 다시 로드(같은 세대를 한 번 더 열 뿐)
+            token = store.generation_token(key)
+            with self._lock:
+                loaded = self._generations.setdefault(key, (token, store.generation(key)))
+        return loaded[1]
+
+    def _discard(self, key: str) -> None:
+        # 이 워커에 로드된 key의 직렬화 결과/스냅샷/매핑만 버림(공유 파일은 유지)
+        source = self._shared[key]
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == key]:
+                del self._entries[entry_key]
+            for snapshot_key in [k for k in self._snapshots if k[0] == key]:
+                del self._snapshots[snapshot_key]
+            # Last-Modified는 새로 여는 파일의 생성 시각을 사용
+            self._modified.pop(key, None)
+            self._generations.pop(key, None)
+        for encoder in ENCODERS:
+            source.store.release(source.name(encoder))
+
+    def snapshot(self, key: str, encoder: str) -> Snapshot:
+        """공유 키의 스냅샷, 블로킹(파일 잠금 대기/생성)이므로 스레드 풀에서 호출
+
+        공유 저장소가 꺼져 있으면(shared_datasets=False) 이 워커 메모리에 스냅샷을 만든다.
+        """
+        snapshot = self._snapshots.get((key, encoder))
+        if snapshot is not None:
+            return snapshot
+        source = self._shared[key]
+
+        def build() -> bytes:
+            return build_snapshot(source.loader(), ENCODERS[encoder], source.list_key)
+
+        if source.store.enabled:
+            version = source.file_version(self._shared_generation(key))
+            buffer: Any = source.store.open(source.name(encoder), version, build)
+        else:
+            buffer = build()
+        snapshot = Snapshot(buffer)
+        with self._lock:
+            return self._snapshots.setdefault((key, encoder), snapshot)
+
+    def load_shared(self, key: str, encoder: str) -> CachedPayload:
+        # 블로킹, 스레드 풀에서 호출, 본문은 스냅샷 payload(mmap을 가리키는 memoryview)
+        source = self._shared[key]
+        body = self.snapshot(key, encoder).payload
+        version = source.file_version(self._shared_generation(key))
+        with self._lock:
+            # Last-Modified를 파일 생성 시각으로 맞춰서 워커가 달라도 같은 값
+            modified = self._modified.setdefault(
+                key, source.store.mtime(source.name(encoder), version) or time.time(),
+            )
+        payload = CachedPayload(body=body, etag=make_etag(body), created_at=modified)
+        with self._lock:
+            return self._entries.setdefault((key, encoder), payload)
+
+    def prebuild_shared(self) -> List[Tuple[str, str]]:
+        # 등록된 공유 키를 인코더별로 모두 생성(배포 이미지 빌드 시), 반환: (이름, 파일 경로)
+        built = []
+        for key, source in self._shared.items():
+            for encoder in ENCODERS:
+                self.snapshot(key, encoder)
+                version = source.file_version(self._shared_generation(key))
+                built.append((source.name(encoder), source.store.path(source.name(encoder), version)))
+        return built
+
+    def last_modified(self, key: str) -> float | None:
+        return self._modified.get(key)
+
+    # 원본 데이터가 바뀌었을 때 호출, key가 None이면 전체 삭제
+    # 공유 키는 파일을 지우고 세대를 올림 -> 다른 워커도 다음 요청에서 기존 매핑을 버리고 새로 생성된 파일을 사용
+    def invalidate(self, key: str | None = None) -> None:
+        now = time.time()
+        shared_keys = [k for k in self._shared if key is None or k == key]
+        for shared_key in shared_keys:
+            source = self._shared[shared_key]
+            # 파일을 먼저 지운 뒤 세대를 올려야 새 세대로 만든 파일을 지우지 않음
+            for encoder in ENCODERS:
+                source.store.remove(source.name(encoder))
+            if source.store.enabled:
+                source.store.bump(shared_key)
+            self._discard(shared_key)
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                for modified_key in self._modified:
+                    self._modified[modified_key] = now
+            elif key not in self._shared:
+                for entry_key in [k for k in self._entries if k[0] == key]:
+                    del self._entries[entry_key]
+                self._modified[key] = now
+        for listener in self._listeners:
+            listener(key)
+
+    # 무효화 시점에 함께 정리해야 하는 파생 캐시(압축본 등)를 등록, 같은 리스너는 한 번만 등록
+    def on_invalidate(self, listener: Callable[[str | None], None]) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str | None], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+
+response_cache: ResponseCache = ResponseCache()
+
+
+def cached_response(
+    key: str,
+    encoder: str = "orjson",
+    cache: ResponseCache = response_cache,
+    bypass: Callable[[Dict[str, Any]], bool] | None = None,
+):
+    """엔드포인트 반환값을 직렬화된 bytes로 캐시하는 데코레이터
+
+    캐시가 채워져 있으면 엔드포인트를 호출하지 않고 저장된 bytes를 그대로 응답한다.
+    엔드포인트가 Response를 직접 반환하면 캐시하지 않고 그대로 전달한다.
+    If-None-Match / If-Modified-Since가 일치하면 직렬화 없이 304로 응답한다.
+    bypass는 엔드포인트 인자(dict)를 받아 True면 캐시를 거치지 않고 엔드포인트를 바로 호출한다.
+    """
+    if encoder not in ENCODERS:
+        raise ValueError(f"unknown encoder: {encoder}")
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        # 조건부 요청 헤더를 읽기 위해 엔드포인트에 Request가 없으면 시그니처에 추가
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request),
+            None,
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "_cache_request"
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        async def call_endpoint(*args: Any, **kwargs: Any) -> Any:
+            if is_coroutine:
+                return await endpoint(*args, **kwargs)
+            return await run_in_threadpool(endpoint, *args, **kwargs)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Response:
+            request: Request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            if bypass is not None and bypass(kwargs):
+                return await call_endpoint(*args, **kwargs)
+            payload = cache.get(key, encoder)
+            last_modified = cache.last_modified(key)
+            etag = payload.etag if payload is not None else None
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(payload, last_modified, request)
+            if payload is None and cache.is_shared(key):
+                # 엔드포인트 대신 공유 파일 사용(다른 워커가 만들어 두었으면 데이터셋을 생성하지 않음)
+                payload = await run_in_threadpool(cache.load_shared, key, encoder)
+            if payload is None:
+                content = await call_endpoint(*args, **kwargs)
+                if isinstance(content, Response):
+                    return content
+                payload = cache.put(key, encoder, content)
+            return payload.to_response()
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
@@ -0,0 +1,209 @@
+# 워커(프로세스) 간 공유하는 직렬화 데이터셋 파일
+# uvicorn --workers N 이면 워커마다 데이터셋을 생성/직렬화해서 메모리와 기동 시간이 워커 수만큼 늘어남
+# 여기서는 처음 필요해진 워커 하나가 파일 잠금(fcntl.flock)을 잡고 만들어 공유 디렉터리(/dev/shm)에 쓰고,
+# 나머지 워커는 만들어진 파일을 읽기 전용 mmap으로 열어서 사용 -> 물리 메모리(page cache)는 한 벌만 사용
+# - 파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 파일이 보이면 항상 완성된 상태
+# - /dev/shm, /tmp는 모든 사용자가 쓸 수 있으므로 그 아래 사용자 전용(0700) 디렉터리를 사용,
+#   소유자/권한이 다르면(다른 사용자가 미리 만든 디렉터리나 심볼릭 링크) 사용하지 않음
+# - 파일 이름에 생성 코드(모듈 소스) 해시를 넣어서 코드가 바뀌면 새 파일을 만들고 이전 파일은 삭제
+# - 삭제/교체된 파일을 이미 매핑한 워커는 기존 매핑을 계속 사용(unlink해도 매핑은 유효)
+# - 원본 데이터가 바뀌면 이름별 세대(generation) 파일의 값을 올림(bump), 다른 워커는 세대 파일이 바뀐 것을 보고
+#   기존 매핑을 버린 뒤 새 세대의 파일을 염(ResponseCache가 요청마다 generation_token으로 확인)
+import glob
+import hashlib
+import mmap
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Callable, Dict, Iterator, Tuple
+
+# fcntl이 없는 환경(Windows)에서는 잠금 없이 워커마다 만들고 마지막에 교체한 파일을 사용
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+def default_directory() -> str:
+    # tmpfs(/dev/shm)가 있으면 디스크 I/O 없이 메모리에만 존재, 사용자(uid)별 하위 디렉터리
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        base = "/dev/shm"
+    else:
+        base = tempfile.gettempdir()
+    owner = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(base, f"fastapi-study-{owner}")
+
+
+def ensure_private_directory(directory: str) -> None:
+    """directory를 현재 사용자만 접근할 수 있는(0700) 디렉터리로 준비
+
+    이미 있으면 심볼릭 링크가 아니고 현재 사용자 소유이며 group/other 권한이 없어야 한다(아니면 PermissionError).
+    """
+    try:
+        os.makedirs(directory, mode=0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Shared dataset directory {directory!r} is not a directory")
+    # uid/권한 비트가 없는 환경(Windows)은 확인 생략
+    if hasattr(os, "getuid"):
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"Shared dataset directory {directory!r} is owned by another user")
+        if info.st_mode & 0o077:
+            raise PermissionError(f"Shared dataset directory {directory!r} is accessible by other users")
+
+
+def source_version(*modules: ModuleType) -> str:
+    # 데이터를 만드는 모듈 소스의 해시, 생성 로직이 바뀌면 다른 파일을 사용
+    digest = hashlib.blake2b(digest_size=8)
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SharedStore:
+    def __init__(self, directory: str | None = None, prefix: str = "fastapi-study") -> None:
+        self.directory = directory or default_directory()
+        self.prefix = prefix
+        self.enabled = True
+        # (이름, 버전) -> 매핑, 워커 안에서는 한 번만 열고 계속 사용
+        self._maps: Dict[Tuple[str, str], mmap.mmap] = {}
+        self._lock = threading.Lock()
+        # 확인을 마친 디렉터리, 파일 경로를 만들 때마다 stat하지 않도록 한 번만 확인
+        self._checked: str | None = None
+
+    def configure(self, directory: str | None = None, enabled: bool = True) -> None:
+        # create_app에서 Setting 값으로 조정
+        self.directory = directory or default_directory()
+        self.enabled = enabled
+
+    def _file_path(self, filename: str) -> str:
+        # 공유 디렉터리 안의 파일 경로, 처음 사용할 때 디렉터리를 만들고 소유자/권한 확인
+        directory = self.directory
+        if self._checked != directory:
+            ensure_private_directory(directory)
+            self._checked = directory
+        return os.path.join(directory, filename)
+
+    def path(self, name: str, version: str) -> str:
+        return self._file_path(f"{self.prefix}-{name}-{version}.bin")
+
+    def open(self, name: str, version: str, build: Callable[[], bytes]) -> mmap.mmap:
+        """공유 파일을 읽기 전용으로 매핑, 없으면 build()로 만들어 저장
+
+        여러 워커가 동시에 호출해도 build는 한 번만 실행된다(파일 잠금). 블로킹 함수이므로 스레드 풀에서 호출한다.
+        """
+        key = (name, version)
+        with self._lock:
+            mapped = self._maps.get(key)
+            if mapped is not None:
+                return mapped
+            path = self.path(name, version)
+            if not os.path.exists(path):
+                self._build(name, path, build)
+            mapped = self._map(path)
+            self._maps[key] = mapped
+            return mapped
+
+    @contextmanager
+    def _file_lock(self, name: str) -> Iterator[None]:
+        # 워커(프로세스) 간 잠금
+        with open(self._file_path(f"{self.prefix}-{name}.lock"), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, path: str, data: bytes) -> None:
+        # 임시 파일은 mkstemp(O_CREAT|O_EXCL, 0600)로 만들어 미리 만들어 둔 파일/링크를 따라가지 않음
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+    def _build(self, name: str, path: str, build: Callable[[], bytes]) -> None:
+        with self._file_lock(name):
+            # 잠금을 기다리는 동안 다른 워커가 만들었으면 그대로 사용
+            if os.path.exists(path):
+                return
+            self._write(path, build())
+            self._remove_stale(name, path)
+
+    def _remove_stale(self, name: str, current: str) -> None:
+        # 같은 이름의 이전 버전 파일 삭제
+        for path in glob.glob(self._file_path(f"{self.prefix}-{name}-*.bin")):
+            if path != current:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _map(path: str) -> mmap.mmap:
+        with open(path, "rb") as f:
+            # 빈 파일은 mmap할 수 없음
+            if os.fstat(f.fileno()).st_size == 0:
+                return mmap.mmap(-1, 1)
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def mtime(self, name: str, version: str) -> float | None:
+        try:
+            return os.path.getmtime(self.path(name, version))
+        except OSError:
+            return None
+
+    def release(self, name: str) -> None:
+        # 이 워커의 매핑만 버림(파일은 유지), 응답에 쓰고 있는 memoryview가 없어지면 해제됨
+        with self._lock:
+            for key in [key for key in self._maps if key[0] == name]:
+                del self._maps[key]
+
+    def remove(self, name: str) -> None:
+        # 원본 데이터가 바뀌었을 때 호출, 이 워커의 매핑과 모든 버전 파일 삭제(다른 워커의 기존 매핑은 유지)
+        self.release(name)
+        with self._lock:
+            self._remove_stale(name, "")
+
+    def _generation_path(self, name: str) -> str:
+        return self._file_path(f"{self.prefix}-{name}.gen")
+
+    def generation(self, name: str) -> int:
+        # 세대 파일이 없으면 0
+        try:
+            with open(self._generation_path(name), "rb") as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def generation_token(self, name: str) -> Tuple[int, int] | None:
+        # 세대 파일이 바뀌었는지 확인하는 값(파일을 읽지 않고 stat 한 번), 교체(os.replace)되면 inode가 바뀜
+        try:
+            stat = os.stat(self._generation_path(name))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def bump(self, name: str) -> int:
+        # 세대를 올려서 모든 워커가 다음 요청에서 새 데이터를 사용하도록 함, 새 세대 반환
+        with self._file_lock(name):
+            generation = self.generation(name) + 1
+            self._write(self._generation_path(name), str(generation).encode())
+        return generation
+
+
+shared_store: SharedStore = SharedStore()
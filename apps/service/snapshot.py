@@ -0,0 +1,146 @@
+# 직렬화 데이터셋 스냅샷 파일 형식(mmap으로 읽기 전용 사용)
+# 전체 응답 bytes와 항목(사용자)별 위치 인덱스를 한 파일에 저장
+# - 압축 형식 JSON은 {"users":[u0,u1,...],...} = prefix + b",".join(항목별 JSON) + suffix 이므로
+#   전체 payload를 한 번만 저장하고 항목은 payload 안의 (offset, length)로 가리킴 -> 항목 조회도 복사 없는 slice
+# - 역직렬화 없이 헤더와 인덱스 배열(memoryview.cast)만 읽으므로 여는 비용은 파일 크기와 무관
+#
+# 레이아웃(little endian)
+#   header   magic(8) | format u32 | count u32 | flags u32 | reserved u32 | payload_offset u64 | payload_length u64 | index_offset u64
+#   payload  전체 JSON bytes
+#   index    ids int64[count](오름차순) | offsets uint64[count](payload 기준) | lengths uint32[count]
+#
+# 스냅샷 미리 만들기(배포 이미지 빌드 시, SHARED_DATASET_DIR에 저장)
+#   python -m apps.service.snapshot
+import bisect
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterator, Sequence
+
+MAGIC = b"FSTSNAP\x00"
+# 2: FLAG_CONTIGUOUS_IDS를 목록 순서 기준으로 계산(이전 형식 파일은 다시 생성)
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIIIIQQQ")
+# flags: 목록 순서의 id가 첫 id부터 1씩 증가하면 위치 = id - ids[0] (bisect 생략), 인덱스 순서 = 목록 순서
+FLAG_CONTIGUOUS_IDS = 1
+
+
+def build_snapshot(
+    payload: Dict[str, Any],
+    encode: Callable[[Any], bytes],
+    list_key: str = "users",
+    id_key: str = "id",
+) -> bytes:
+    """payload[list_key]의 항목별 위치 인덱스를 포함한 스냅샷 bytes
+
+    encode는 공백 없는 JSON 인코더여야 한다(encode_json, encode_orjson). 조립한 전체 payload가
+    encode(payload)와 다르면 ValueError.
+    """
+    items = payload[list_key]
+    encoded = [encode(item) for item in items]
+    # 목록을 비운 payload에서 목록 위치를 찾아 앞/뒤를 나눔
+    empty = encode({**payload, list_key: []})
+    marker = encode(list_key) + b":[]"
+    position = empty.find(marker)
+    if position < 0:
+        raise ValueError(f"Cannot locate {list_key!r} in the encoded payload")
+    prefix = empty[:position + len(marker) - 1]
+    suffix = empty[position + len(marker) - 1:]
+    body = prefix + b",".join(encoded) + suffix
+    if body != encode(payload):
+        raise ValueError("Encoder output is not concatenable (non-compact JSON?)")
+
+    entries = []
+    offset = len(prefix)
+    for item, data in zip(items, encoded):
+        entries.append((item[id_key], offset, len(data)))
+        offset += len(data) + 1
+    # 목록 순서 그대로 ids[0]부터 1씩 증가할 때만 표시, 정렬 후 연속인 경우([3, 1, 2] 등)는 제외
+    # (items()가 이 플래그로 정렬된 인덱스 순서를 목록 순서로 간주함)
+    first = entries[0][0] if entries else 0
+    contiguous = bool(entries) and all(entry[0] == first + i for i, entry in enumerate(entries))
+    entries.sort()
+    ids = [entry[0] for entry in entries]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate {id_key!r} values")
+    flags = FLAG_CONTIGUOUS_IDS if contiguous else 0
+
+    payload_offset = HEADER.size
+    # 인덱스는 8바이트 경계에 맞춤
+    index_offset = payload_offset + len(body) + (-(payload_offset + len(body)) % 8)
+    count = len(entries)
+    return b"".join([
+        HEADER.pack(MAGIC, FORMAT_VERSION, count, flags, 0, payload_offset, len(body), index_offset),
+        body,
+        b"\x00" * (index_offset - payload_offset - len(body)),
+        struct.pack(f"<{count}q", *ids),
+        struct.pack(f"<{count}Q", *(entry[1] for entry in entries)),
+        struct.pack(f"<{count}I", *(entry[2] for entry in entries)),
+    ])
+
+
+def _index(view: memoryview, typecode: str) -> Sequence[int]:
+    # little endian 환경이면 복사 없이 mmap을 그대로 배열로 사용, 아니면 바이트 순서를 바꾼 복사본
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array(typecode, bytes(view))
+    values.byteswap()
+    return values
+
+
+class Snapshot:
+    # buffer: mmap 또는 bytes, 읽기만 함
+    def __init__(self, buffer: Any) -> None:
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, count, flags, _, payload_offset, payload_length, index_offset = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a snapshot file (or unsupported format version)")
+        if index_offset + count * 20 > len(view):
+            raise ValueError("Snapshot is truncated")
+        self.count = count
+        self.payload = view[payload_offset:payload_offset + payload_length]
+        self.ids: Sequence[int] = _index(view[index_offset:index_offset + 8 * count], "q")
+        self.offsets: Sequence[int] = _index(view[index_offset + 8 * count:index_offset + 16 * count], "Q")
+        self.lengths: Sequence[int] = _index(view[index_offset + 16 * count:index_offset + 20 * count], "I")
+        self.contiguous = bool(flags & FLAG_CONTIGUOUS_IDS)
+        self.first_id = self.ids[0] if count else 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def position(self, item_id: int) -> int | None:
+        if self.contiguous:
+            position = item_id - self.first_id
+            return position if 0 <= position < self.count else None
+        position = bisect.bisect_left(self.ids, item_id)
+        return position if position < self.count and self.ids[position] == item_id else None
+
+    def items(self) -> Iterator[memoryview]:
+        # 항목 JSON bytes를 원래 목록 순서(payload 안의 위치 순서)로
+        positions = range(self.count)
+        if not self.contiguous:
+            positions = sorted(positions, key=self.offsets.__getitem__)
+        for position in positions:
+            offset = self.offsets[position]
+            yield self.payload[offset:offset + self.lengths[position]]
+
+    def item(self, item_id: int) -> memoryview | None:
+        # 항목 하나의 JSON bytes(payload의 slice), 없으면 None
+        position = self.position(item_id)
+        if position is None:
+            return None
+        offset = self.offsets[position]
+        return self.payload[offset:offset + self.lengths[position]]
+
+
+if __name__ == "__main__":
+    from ..config import Setting, create_app
+    from .response_cache import response_cache
+
+    # 라우트 모듈이 등록한 공유 키(response_cache.share)를 설정된 디렉터리에 모두 생성
+    settings = Setting()
+    create_app(settings)
+    for name, path in response_cache.prebuild_shared():
+        print(f"{name}: {path}")
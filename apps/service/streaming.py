@@ -0,0 +1,49 @@
+# 이미 직렬화된 스냅샷(service.snapshot)을 청크/원소 단위로 흘려보내는 StreamingResponse
+# 요청마다 dict 데이터셋을 직렬화하지 않고 스냅샷의 payload/항목 slice를 그대로 전송, 요청당 버퍼는 chunk_size 정도
+from typing import Any, AsyncIterator, Iterable, Literal
+
+from fastapi.responses import StreamingResponse
+
+from .snapshot import Snapshot
+
+# 한 번에 내보내는 청크 크기, 요청 하나가 잡고 있는 버퍼는 이 크기 정도로 제한
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+
+StreamFormat = Literal["array", "ndjson"]
+
+
+async def _chunked(parts: Iterable[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    # 작은 조각을 모아서 chunk_size 단위로 yield
+    # StreamingResponse가 send를 await 하므로 클라이언트가 느리면 여기서 생성이 멈춤(back-pressure)
+    # 조각은 bytes 또는 memoryview(스냅샷 slice), join 결과는 항상 bytes
+    buffer: list[bytes] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def stream_snapshot(
+    snapshot: Snapshot,
+    stream_format: StreamFormat = "array",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StreamingResponse:
+    """스냅샷을 StreamingResponse로 전송
+
+    array: payload(전체 document, 일반 응답과 바이트 단위로 동일)를 chunk_size 단위로
+    ndjson: list_key의 원소(항목)만 한 줄에 하나씩
+    """
+    if stream_format == "ndjson":
+        parts: Iterable[Any] = (part for item in snapshot.items() for part in (item, b"\n"))
+        media_type = "application/x-ndjson"
+    else:
+        payload = snapshot.payload
+        parts = (payload[start:start + chunk_size] for start in range(0, len(payload), chunk_size))
+        media_type = "application/json"
+    return StreamingResponse(_chunked(parts, chunk_size), media_type=media_type)
@@ -0,0 +1,144 @@
+# 요청한 크기/형태의 합성 페이로드 생성기, 직렬화 처리량 vs 페이로드 크기 곡선 측정용
+import random
+import string
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Tuple
+
+ALPHANUMERIC: str = string.ascii_letters + string.digits
+
+# 바이트 값 0~255를 영숫자 62개로 매핑하는 변환 테이블
+# random.choices로 한 글자씩 뽑아 join 하는 대신 randbytes + bytes.translate로 C 레벨에서 한 번에 변환
+# 256이 62의 배수가 아니라 앞쪽 문자가 약간 더 자주 나오지만 테스트 데이터 용도로는 무시 가능
+_ALPHANUMERIC_TABLE: bytes = bytes(ord(ALPHANUMERIC[b % len(ALPHANUMERIC)]) for b in range(256))
+
+
+def fast_random_string(length: int, rng: random.Random = random) -> str:
+    return rng.randbytes(length).translate(_ALPHANUMERIC_TABLE).decode("ascii")
+
+
+def fast_random_strings(count: int, length: int, rng: random.Random = random) -> list[str]:
+    # 필요한 문자열 전체를 한 번에 생성한 뒤 잘라서 사용
+    blob = fast_random_string(count * length, rng)
+    return [blob[i:i + length] for i in range(0, count * length, length)]
+
+
+def fast_random_floats(count: int, scale: float, rng: random.Random = random) -> list[float]:
+    # 32bit 정수 배열을 한 번에 만들고 [-scale, scale) 범위 소수점 2자리 실수로 변환
+    raw = array("I", rng.randbytes(4 * count))
+    step = 2 * scale / 2 ** 32
+    return [round(value * step - scale, 2) for value in raw]
+
+
+def _build_level(
+    fields: int,
+    numeric_fields: int,
+    depth: int,
+    string_length: int,
+    rng: random.Random,
+) -> dict:
+    string_fields = fields - numeric_fields
+    level: dict = dict(zip(
+        [f"s{i}" for i in range(string_fields)],
+        fast_random_strings(string_fields, string_length, rng),
+    ))
+    level.update(zip(
+        [f"n{i}" for i in range(numeric_fields)],
+        fast_random_floats(numeric_fields, 10000.0, rng),
+    ))
+    if depth > 0:
+        level["nested"] = _build_level(fields, numeric_fields, depth - 1, string_length, rng)
+    return level
+
+
+def build_synthetic_payload(
+    user_count: int = 1000,
+    depth: int = 1,
+    string_length: int = 100,
+    fields: int = 8,
+    numeric_ratio: float = 0.5,
+    seed: int = 0,
+) -> dict:
+    """합성 페이로드 생성
+
+    user_count: 사용자 수
+    depth: 사용자별 중첩 dict 깊이(0이면 평평한 구조)
+    string_length: 문자열 필드 하나의 길이
+    fields: 각 레벨의 leaf 필드 수
+    numeric_ratio: leaf 필드 중 숫자 필드의 비율(0~1)
+    """
+    rng = random.Random(seed)
+    numeric_fields = round(fields * numeric_ratio)
+    users = [
+        {"id": i, **_build_level(fields, numeric_fields, depth, string_length, rng)}
+        for i in range(user_count)
+    ]
+    return {
+        "users": users,
+        "meta": {
+            "user_count": user_count,
+            "depth": depth,
+            "string_length": string_length,
+            "fields": fields,
+            "numeric_ratio": numeric_ratio,
+            "seed": seed,
+        },
+    }
+
+
+# 대략적인 문자열 바이트 수, 라우트에서 너무 큰 요청을 거절하는 데 사용
+def estimate_payload_size(
+    user_count: int, depth: int, string_length: int, fields: int, numeric_ratio: float
+) -> int:
+    numeric_fields = round(fields * numeric_ratio)
+    per_level = (fields - numeric_fields) * (string_length + 8) + numeric_fields * 16
+    return user_count * per_level * (depth + 1)
+
+
+SyntheticKey = Tuple[int, int, int, int, float, int]
+
+
+class SyntheticPayloadCache:
+    # 같은 형태로 반복 측정할 때 생성 비용이 섞이지 않도록 최근 페이로드를 메모이즈
+    # 항목 수가 아니라 추정 크기 합으로 제한, 상한보다 큰 페이로드는 매번 새로 생성
+    # (MAX_SYNTHETIC_BYTES급 페이로드 몇 개만 남아도 워커당 수 GB를 잡게 됨)
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[SyntheticKey, Tuple[int, dict]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: SyntheticKey) -> dict:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+        user_count, depth, string_length, fields, numeric_ratio, seed = key
+        payload = build_synthetic_payload(user_count, depth, string_length, fields, numeric_ratio, seed)
+        size = estimate_payload_size(user_count, depth, string_length, fields, numeric_ratio)
+        if size > self.max_bytes:
+            return payload
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (size, payload)
+                self._size += size
+            while self._size > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)[1]
+                self._size -= evicted
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+synthetic_payloads: SyntheticPayloadCache = SyntheticPayloadCache()
+
+
+def get_synthetic_payload(
+    user_count: int, depth: int, string_length: int, fields: int, numeric_ratio: float, seed: int
+) -> dict:
+    return synthetic_payloads.get((user_count, depth, string_length, fields, numeric_ratio, seed))
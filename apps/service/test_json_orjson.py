@@ -1,69 +1,129 @@
 import random
-import string
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+from .synthetic import fast_random_string
+
+# 데이터셋은 import 시점이 아니라 처음 사용할 때 생성(lazy), 워커 부팅과 --reload 시간을 페이로드 크기와 무관하게 유지
+# seed를 고정하여 워커/재시작과 관계없이 같은 데이터가 생성되도록 함 -> ETag도 워커 간에 동일
+DEFAULT_SEED = 20250101
 
 # 임의의 큰 문자열을 생성하는 함수
-def random_string(length=50):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+# random.choices + join 대신 randbytes + translate 사용(synthetic.fast_random_string)
+def random_string(length=50, rng: random.Random = random):
+    return fast_random_string(length, rng)
 
 # 시작 날짜 설정
 base_date = datetime(2025, 1, 1, 12, 0, 0)
 
-# 사용자 데이터 리스트 생성 (예: 1000명의 사용자)
-users = []
-for i in range(1000):
-    user = {
-        "id": i,
-        "name": f"User{i}",
-        "email": f"user{i}@example.com",
-        "is_active": i % 2 == 0,
-        "balance": round(random.uniform(0, 10000), 2),
-        "bio": random_string(200),  # 큰 텍스트 필드
-        "friends": [random.randint(0, 999) for _ in range(10)],  # 10명의 친구 id
-        "settings": {
-            "theme": "dark" if i % 2 == 0 else "light",
-            "notifications": random.choice([True, False]),
-            "language": random.choice(["en-US", "ko-KR", "es-ES", "fr-FR"]),
-            "preferences": {
-                "emails": random.choice([True, False]),
-                "sms": random.choice([True, False]),
-                "push": random.choice([True, False])
+def build_test_data(
+    user_count: int = 1000,
+    bio_length: int = 200,
+    description_length: int = 100,
+    tag_length: int = 5,
+    seed: int = DEFAULT_SEED,
+    convert: Optional[Callable[[dict], Any]] = None,
+) -> dict:
+    # convert: 사용자 dict를 만들 때마다 다른 표현(service.records 등)으로 바꿔서 보관, dict 목록 전체를 동시에 들고 있지 않음
+    rng = random.Random(seed)
+
+    # 사용자 데이터 리스트 생성 (예: 1000명의 사용자)
+    users = []
+    # summary는 변환 전 dict 기준으로 같은 순서로 누적(sum()과 같은 결과)
+    active_users = 0
+    total_balance = 0
+    for i in range(user_count):
+        user = {
+            "id": i,
+            "name": f"User{i}",
+            "email": f"user{i}@example.com",
+            "is_active": i % 2 == 0,
+            "balance": round(rng.uniform(0, 10000), 2),
+            "bio": random_string(bio_length, rng),  # 큰 텍스트 필드
+            "friends": [rng.randint(0, 999) for _ in range(10)],  # 10명의 친구 id
+            "settings": {
+                "theme": "dark" if i % 2 == 0 else "light",
+                "notifications": rng.choice([True, False]),
+                "language": rng.choice(["en-US", "ko-KR", "es-ES", "fr-FR"]),
+                "preferences": {
+                    "emails": rng.choice([True, False]),
+                    "sms": rng.choice([True, False]),
+                    "push": rng.choice([True, False])
+                }
+            },
+            "transactions": [
+                {
+                    "date": (base_date + timedelta(days=rng.randint(0, 365))).isoformat() + "Z",
+                    "amount": round(rng.uniform(-500, 500), 2),
+                    "description": random_string(description_length, rng)
+                }
+                for _ in range(5)
+            ],
+            "metadata": {
+                "created_at": base_date.isoformat() + "Z",
+                "updated_at": (base_date + timedelta(days=rng.randint(1, 365))).isoformat() + "Z",
+                "tags": [random_string(tag_length, rng) for _ in range(5)]
             }
+        }
+        active_users += user["is_active"]
+        total_balance += user["balance"]
+        users.append(convert(user) if convert is not None else user)
+
+    # 최종 테스트 데이터 dict
+    # generated_at은 재현 가능하도록 생성 시각 대신 base_date 사용
+    return {
+        "users": users,
+        "summary": {
+            "total_users": len(users),
+            "active_users": active_users,
+            "total_balance": total_balance,
+            "generated_at": base_date.isoformat() + "Z"
         },
-        "transactions": [
-            {
-                "date": (base_date + timedelta(days=random.randint(0, 365))).isoformat() + "Z",
-                "amount": round(random.uniform(-500, 500), 2),
-                "description": random_string(100)
+        "config": {
+            "version": "1.0.0",
+            "features": {
+                "enable_logging": True,
+                "max_connections": 100,
+                "supported_languages": ["en", "ko", "es", "fr", "de"]
             }
-            for _ in range(5)
-        ],
-        "metadata": {
-            "created_at": base_date.isoformat() + "Z",
-            "updated_at": (base_date + timedelta(days=random.randint(1, 365))).isoformat() + "Z",
-            "tags": [random_string(5) for _ in range(5)]
-        }
-    }
-    users.append(user)
-
-# 최종 테스트 데이터 dict
-test_data = {
-    "users": users,
-    "summary": {
-        "total_users": len(users),
-        "active_users": sum(1 for u in users if u["is_active"]),
-        "total_balance": sum(u["balance"] for u in users),
-        "generated_at": datetime.now().isoformat() + "Z"
-    },
-    "config": {
-        "version": "1.0.0",
-        "features": {
-            "enable_logging": True,
-            "max_connections": 100,
-            "supported_languages": ["en", "ko", "es", "fr", "de"]
         }
     }
-}
+
+# 파라미터 조합별로 생성 결과를 메모이즈, 인자는 위치 인자로 정규화해서 같은 조합이 같은 키가 되도록 함
+# async 라우트가 첫 생성만 스레드 풀로 보낼 수 있도록 이미 생성된 데이터셋을 조회(peek_test_data)할 수 있는 dict 사용
+TEST_DATA_CACHE_SIZE = 8
+_test_data: Dict[tuple, dict] = {}
+_test_data_lock = threading.Lock()
+
+def peek_test_data(
+    user_count: int = 1000,
+    bio_length: int = 200,
+    description_length: int = 100,
+    tag_length: int = 5,
+    seed: int = DEFAULT_SEED,
+) -> Optional[dict]:
+    return _test_data.get((user_count, bio_length, description_length, tag_length, seed))
+
+def get_test_data(
+    user_count: int = 1000,
+    bio_length: int = 200,
+    description_length: int = 100,
+    tag_length: int = 5,
+    seed: int = DEFAULT_SEED,
+) -> dict:
+    key = (user_count, bio_length, description_length, tag_length, seed)
+    data = _test_data.get(key)
+    if data is not None:
+        return data
+    with _test_data_lock:
+        data = _test_data.get(key)
+        if data is None:
+            data = build_test_data(*key)
+            _test_data[key] = data
+            while len(_test_data) > TEST_DATA_CACHE_SIZE:
+                del _test_data[next(iter(_test_data))]
+    return data
 
 """
 사용자 리스트(1000명의 사용자), 각 사용자의 다양한 속성(큰 문자열, 리스트, 중첩 딕셔너리 등)과 요약 정보를 포함하여, 
@@ -84,42 +144,82 @@ postman api test 결과
     - orjson은 낮은 latency를 가지므로 트래픽이 생기면 각 처리 속도에 유리할 수 있음 (참고: https://chaechae.life/blog/fastapi-response-performance)
 """
 
-import random
-import string
 import json
 
-def random_string_v2(length):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-
-users_v2 = []
-for i in range(1800):
-    user_v2 = {
-        "id": i,
-        "name": random_string_v2(100),           # 약 100자
-        "email": random_string_v2(20) + "@example.com",  # 약 20자 + 도메인
-        "bio": random_string_v2(500),             # 약 500자
-        "friends": [random.randint(0, 999) for _ in range(20)],
-        "settings": {
-            "theme": "dark" if i % 2 == 0 else "light",
-            "notifications": random.choice([True, False]),
-            "language": random.choice(["en-US", "ko-KR", "es-ES", "fr-FR"])
-        },
-        "transactions": [
-            {
-                "date": "2025-01-01",
-                "amount": round(random.uniform(-100, 100), 2),
-                "description": random_string_v2(200)  # 약 200자
-            }
-            for _ in range(10)
-        ]
-    }
-    users_v2.append(user_v2)
-
-test_data_v2 = {"users": users_v2, "generated_at": "2025-01-01T12:00:00Z"}
+def random_string_v2(length, rng: random.Random = random):
+    return fast_random_string(length, rng)
+
+def build_test_data_v2(
+    user_count: int = 1800,
+    name_length: int = 100,
+    email_length: int = 20,
+    bio_length: int = 500,
+    description_length: int = 200,
+    seed: int = DEFAULT_SEED,
+    convert: Optional[Callable[[dict], Any]] = None,
+) -> dict:
+    rng = random.Random(seed)
+
+    users_v2 = []
+    for i in range(user_count):
+        user_v2 = {
+            "id": i,
+            "name": random_string_v2(name_length, rng),           # 약 100자
+            "email": random_string_v2(email_length, rng) + "@example.com",  # 약 20자 + 도메인
+            "bio": random_string_v2(bio_length, rng),             # 약 500자
+            "friends": [rng.randint(0, 999) for _ in range(20)],
+            "settings": {
+                "theme": "dark" if i % 2 == 0 else "light",
+                "notifications": rng.choice([True, False]),
+                "language": rng.choice(["en-US", "ko-KR", "es-ES", "fr-FR"])
+            },
+            "transactions": [
+                {
+                    "date": "2025-01-01",
+                    "amount": round(rng.uniform(-100, 100), 2),
+                    "description": random_string_v2(description_length, rng)  # 약 200자
+                }
+                for _ in range(10)
+            ]
+        }
+        users_v2.append(convert(user_v2) if convert is not None else user_v2)
+
+    return {"users": users_v2, "generated_at": "2025-01-01T12:00:00Z"}
+
+@lru_cache(maxsize=8)
+def _cached_test_data_v2(user_count, name_length, email_length, bio_length, description_length, seed) -> dict:
+    return build_test_data_v2(user_count, name_length, email_length, bio_length, description_length, seed)
+
+def get_test_data_v2(
+    user_count: int = 1800,
+    name_length: int = 100,
+    email_length: int = 20,
+    bio_length: int = 500,
+    description_length: int = 200,
+    seed: int = DEFAULT_SEED,
+) -> dict:
+    return _cached_test_data_v2(user_count, name_length, email_length, bio_length, description_length, seed)
+
+# 원본 파라미터나 생성 로직이 바뀌었을 때 메모이즈된 데이터셋 제거
+# 직렬화 캐시를 쓰는 라우트는 response_cache.invalidate()도 함께 호출해야 함
+def clear_dataset_cache() -> None:
+    with _test_data_lock:
+        _test_data.clear()
+    _cached_test_data_v2.cache_clear()
+
+# 기존 `from test_json_orjson import test_data, test_data_v2` 사용처 호환, 접근하는 시점에 생성
+def __getattr__(name: str):
+    if name == "test_data":
+        return get_test_data()
+    if name == "test_data_v2":
+        return get_test_data_v2()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 최종적으로 JSON으로 직렬화한 후 크기를 확인
-serialized_v2 = json.dumps(test_data_v2)
-print(f"JSON payload size: {len(serialized_v2.encode('utf-8')) / (1024 * 1024):.2f} MB")
+# python -m apps.service.test_json_orjson 으로 실행 시에만 출력
+if __name__ == "__main__":
+    serialized_v2 = json.dumps(get_test_data_v2())
+    print(f"JSON payload size: {len(serialized_v2.encode('utf-8')) / (1024 * 1024):.2f} MB")
 
 """
 사용자 리스트(1800명의 사용자), 각 사용자의 다양한 속성(큰 문자열, 리스트, 중첩 딕셔너리 등)과 요약 정보를 포함하여, 
@@ -0,0 +1,230 @@
+# 메모리 사용자 데이터셋(test_data["users"]) 조회 엔진
+# 요청마다 리스트 전체를 훑지 않도록 데이터셋별로 한 번 보조 인덱스를 만들어 두고 필터/정렬/projection 처리
+# - 범주형 필드(is_active, settings.language, settings.theme): 값 -> 위치 집합(hash index)
+# - 숫자 범위(balance): 값으로 정렬한 배열, bisect로 범위 위치만 잘라냄
+# - 목록 필드(friends, metadata.tags): 원소 -> 위치 집합(inverted index)
+# - 정렬: 정렬 기준별 KeysetIndex(pagination), cursor 위치는 bisect로 찾음
+# 인덱스는 만든 뒤 수정하지 않으므로 여러 스레드에서 동시에 조회해도 안전
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Sequence, Set
+
+from .pagination import KeysetIndex, KeysetKey
+
+User = Dict[str, Any]
+
+# 이름 -> 값 추출 함수, 데이터셋에 없는 필드(test_data_v2의 metadata 등)는 인덱스를 만들지 않음
+CATEGORICAL_FIELDS: Dict[str, Callable[[User], Any]] = {
+    "is_active": lambda user: user["is_active"],
+    "language": lambda user: user["settings"]["language"],
+    "theme": lambda user: user["settings"]["theme"],
+}
+MEMBERSHIP_FIELDS: Dict[str, Callable[[User], Iterable[Any]]] = {
+    "friend": lambda user: user["friends"],
+    "tags": lambda user: user["metadata"]["tags"],
+}
+SORT_FIELDS: Dict[str, Callable[[User], Any]] = {
+    "id": lambda user: user["id"],
+    "name": lambda user: user["name"],
+    "balance": lambda user: user["balance"],
+    "created_at": lambda user: user["metadata"]["created_at"],
+    "updated_at": lambda user: user["metadata"]["updated_at"],
+}
+
+# 조건에 맞는 항목이 전체의 이 비율보다 많으면 정렬하지 않고 정렬 인덱스를 순서대로 훑으며 골라냄(limit개 찾으면 중단)
+SCAN_RATIO = 0.25
+
+
+def _has_field(users: Sequence[User], extract: Callable[[User], Any]) -> bool:
+    try:
+        for user in users:
+            extract(user)
+    except (KeyError, TypeError):
+        return False
+    return True
+
+
+@dataclass
+class UserQuery:
+    # None이면 조건 없음
+    is_active: bool | None = None
+    language: str | None = None
+    theme: str | None = None
+    min_balance: float | None = None
+    max_balance: float | None = None
+    # 이 id를 친구로 가진 사용자
+    friend: int | None = None
+    # 태그 중 하나라도 가진 사용자
+    tags: List[str] = field(default_factory=list)
+    order_by: str = "id"
+    desc: bool = False
+    limit: int = 100
+    offset: int = 0
+    # 이전 페이지 마지막 항목의 (order_by 값, id)
+    after: KeysetKey | None = None
+    # 반환할 최상위 필드, 비어 있으면 전체
+    fields: List[str] = field(default_factory=list)
+
+
+@dataclass
+class UserQueryResult:
+    users: List[User]
+    # 조건에 맞는 전체 항목 수(cursor/offset 적용 전)
+    total: int
+    # 다음 페이지가 있으면 마지막 항목의 (order_by 값, id)
+    last: KeysetKey | None
+
+
+class UserQueryEngine:
+    def __init__(self, users: Sequence[User]) -> None:
+        self.users = users
+        self.size = len(users)
+        self.categorical: Dict[str, Dict[Any, FrozenSet[int]]] = {}
+        for name, extract in CATEGORICAL_FIELDS.items():
+            if _has_field(users, extract):
+                self.categorical[name] = self._group(((extract(user),) for user in users))
+        self.membership: Dict[str, Dict[Any, FrozenSet[int]]] = {}
+        for name, extract in MEMBERSHIP_FIELDS.items():
+            if _has_field(users, extract):
+                self.membership[name] = self._group(extract(user) for user in users)
+        # balance 오름차순 값 배열과 같은 순서의 위치 배열
+        ordered = sorted((user["balance"], position) for position, user in enumerate(users))
+        self.balances: List[float] = [entry[0] for entry in ordered]
+        self.balance_positions: List[int] = [entry[1] for entry in ordered]
+        self.sort_indexes: Dict[str, KeysetIndex] = {}
+        # 정렬 기준별 위치 -> 순위, 후보 집합을 정렬할 때 key로 사용
+        self.ranks: Dict[str, List[int]] = {}
+        for name, extract in SORT_FIELDS.items():
+            if not _has_field(users, extract):
+                continue
+            index = KeysetIndex(users, extract)
+            rank = [0] * self.size
+            for order, position in enumerate(index.order):
+                rank[position] = order
+            self.sort_indexes[name] = index
+            self.ranks[name] = rank
+
+    @staticmethod
+    def _group(values: Iterable[Iterable[Any]]) -> Dict[Any, FrozenSet[int]]:
+        groups: Dict[Any, Set[int]] = {}
+        for position, keys in enumerate(values):
+            for key in keys:
+                groups.setdefault(key, set()).add(position)
+        return {key: frozenset(positions) for key, positions in groups.items()}
+
+    def _candidates(self, query: UserQuery) -> Set[int] | FrozenSet[int] | None:
+        # 조건별 위치 집합을 작은 것부터 교집합, 조건이 없으면 None(전체)
+        sets: List[Set[int] | FrozenSet[int]] = []
+        for name in ("is_active", "language", "theme"):
+            value = getattr(query, name)
+            if value is not None:
+                sets.append(self._lookup(self.categorical, name, [value]))
+        if query.friend is not None:
+            sets.append(self._lookup(self.membership, "friend", [query.friend]))
+        if query.tags:
+            sets.append(self._lookup(self.membership, "tags", query.tags))
+        if query.min_balance is not None or query.max_balance is not None:
+            low = bisect.bisect_left(self.balances, query.min_balance) if query.min_balance is not None else 0
+            high = bisect.bisect_right(self.balances, query.max_balance) if query.max_balance is not None else self.size
+            sets.append(set(self.balance_positions[low:high]))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            if not result:
+                break
+            result = result & other
+        return result
+
+    @staticmethod
+    def _lookup(indexes: Dict[str, Dict[Any, FrozenSet[int]]], name: str, values: List[Any]) -> Set[int] | FrozenSet[int]:
+        # 여러 값이면 합집합(하나라도 일치)
+        if name not in indexes:
+            raise ValueError(f"Dataset has no {name!r} field")
+        index = indexes[name]
+        if len(values) == 1:
+            return index.get(values[0], frozenset())
+        return frozenset().union(*(index.get(value, frozenset()) for value in values))
+
+    def query(self, query: UserQuery) -> UserQueryResult:
+        if query.order_by not in self.sort_indexes:
+            raise ValueError(f"Cannot order by {query.order_by!r}")
+        for name in query.fields:
+            if self.users and name not in self.users[0]:
+                raise ValueError(f"Unknown field {name!r}")
+        index = self.sort_indexes[query.order_by]
+        rank = self.ranks[query.order_by]
+        candidates = self._candidates(query)
+        total = self.size if candidates is None else len(candidates)
+
+        # cursor 위치(정렬 인덱스 순위), desc면 그보다 앞, 아니면 그보다 뒤만 대상
+        bound: int | None = None
+        if query.after is not None:
+            try:
+                bound = (
+                    bisect.bisect_left(index.keys, query.after)
+                    if query.desc
+                    else bisect.bisect_right(index.keys, query.after)
+                )
+            except TypeError as exc:
+                raise ValueError("Malformed cursor") from exc
+
+        needed = query.offset + query.limit
+        if candidates is None or len(candidates) > self.size * SCAN_RATIO:
+            # 후보가 많으면 정렬된 순서대로 훑으며 limit개를 찾을 때까지만 진행
+            if query.desc:
+                start = bound - 1 if bound is not None else self.size - 1
+                order_positions: Iterable[int] = range(start, -1, -1)
+            else:
+                order_positions = range(bound or 0, self.size)
+            ranked: List[int] = []
+            for order in order_positions:
+                position = index.order[order]
+                if candidates is None or position in candidates:
+                    ranked.append(order)
+                    # 다음 페이지 유무 확인을 위해 하나 더 찾음
+                    if len(ranked) > needed:
+                        break
+        else:
+            ranked = sorted((rank[position] for position in candidates), reverse=query.desc)
+            if bound is not None:
+                ranked = [order for order in ranked if (order < bound if query.desc else order >= bound)]
+
+        page_orders = ranked[query.offset:needed]
+        has_more = len(ranked) > needed
+        users = [self.users[index.order[order]] for order in page_orders]
+        if query.fields:
+            users = [{name: user[name] for name in query.fields} for user in users]
+        last = index.keys[page_orders[-1]] if has_more and page_orders else None
+        return UserQueryResult(users, total, last)
+
+
+class UserQueryEngineCache:
+    # 데이터셋(리스트 객체)별 엔진, 데이터셋이 바뀌면(다른 객체) 새로 만듦
+    def __init__(self) -> None:
+        self._engine: UserQueryEngine | None = None
+        self._lock = threading.Lock()
+
+    def peek(self, users: Sequence[User]) -> UserQueryEngine | None:
+        engine = self._engine
+        return engine if engine is not None and engine.users is users else None
+
+    def get(self, users: Sequence[User]) -> UserQueryEngine:
+        """users의 엔진, 없으면 생성(블로킹, async 라우트에서는 스레드 풀에서 호출)"""
+        engine = self.peek(users)
+        if engine is not None:
+            return engine
+        with self._lock:
+            if self._engine is None or self._engine.users is not users:
+                self._engine = UserQueryEngine(users)
+            return self._engine
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engine = None
+
+
+user_query_engines: UserQueryEngineCache = UserQueryEngineCache()
+
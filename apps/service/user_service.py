@@ -0,0 +1,177 @@
+# User/Address CRUD, l_sql 라우터에서 AsyncSession을 주입받아 사용
+from typing import Any, Dict, Iterable, List, Literal, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from ..db.models import Address, User
+from ..db.statements import statements
+
+# User.addresses 로딩 방식
+#   selectin: 사용자 조회 1번 + 주소를 IN (...)으로 1번, 페이지 크기와 무관하게 쿼리 2번
+#   joined: LEFT OUTER JOIN으로 쿼리 1번, 사용자 행이 주소 수만큼 중복되어 전송량이 늘어남
+#   raise: 주소를 로딩하지 않고 접근 시 예외, 주소가 필요 없는 목록용
+LoaderStrategy = Literal["selectin", "joined", "raise"]
+
+def user_loader_options(loader: LoaderStrategy) -> LoaderOption:
+    if loader == "selectin":
+        return selectinload(User.addresses)
+    if loader == "joined":
+        return joinedload(User.addresses)
+    return raiseload(User.addresses)
+
+# async 세션에서는 lazy loading(암묵적 I/O)을 쓸 수 없으므로 addresses를 함께 조회
+# 자주 실행되는 단건 조회/주소 목록/개수는 미리 등록한 lambda 문장(db.statements)으로 실행
+async def get_user(session: AsyncSession, user_id: int, loader: LoaderStrategy = "selectin") -> User | None:
+    result = await statements.execute(session, "user.get_by_id", user_id=user_id, loader=loader)
+    # joinedload 컬렉션은 사용자 행이 주소 수만큼 반복되므로 unique()로 합침
+    return result.scalars().unique().one_or_none()
+
+async def count_users(session: AsyncSession) -> int:
+    return (await statements.execute(session, "user.count")).scalar_one()
+
+# 정렬 가능한 컬럼, FilterParams.order_by 값과 같은 이름
+ORDER_COLUMNS = {
+    "id": User.id,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+
+# order_by 컬럼 + id 순서로 정렬, after가 있으면 keyset 방식으로 그 다음 행부터 조회
+# (col, id) > (?, ?) 조건과 ORDER BY col, id가 복합 인덱스(ix_user_account_<col>_id)를 그대로 사용하므로
+# 깊은 페이지도 OFFSET처럼 앞의 행을 건너뛰지 않음
+async def list_users(
+    session: AsyncSession,
+    limit: int,
+    offset: int = 0,
+    order_by: str = "id",
+    after: Tuple[Any, int] | None = None,
+    loader: LoaderStrategy = "selectin",
+) -> Sequence[User]:
+    column = ORDER_COLUMNS[order_by]
+    stmt = select(User).limit(limit).options(user_loader_options(loader))
+    if column is User.id:
+        stmt = stmt.order_by(User.id)
+        if after is not None:
+            stmt = stmt.where(User.id > after[1])
+    else:
+        stmt = stmt.order_by(column, User.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(column, User.id) > tuple_(*after))
+    if offset:
+        stmt = stmt.offset(offset)
+    return (await session.scalars(stmt)).unique().all()
+
+async def create_user(
+    session: AsyncSession, name: str, fullname: str | None, addresses: Iterable[str] = ()
+) -> User:
+    user = User(
+        name=name,
+        fullname=fullname,
+        addresses=[Address(email_address=email) for email in addresses],
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+async def update_user(session: AsyncSession, user: User, values: Dict[str, Any]) -> User:
+    for key, value in values.items():
+        setattr(user, key, value)
+    await session.commit()
+    return user
+
+async def delete_user(session: AsyncSession, user: User) -> None:
+    await session.delete(user)
+    await session.commit()
+
+async def add_address(session: AsyncSession, user: User, email_address: str) -> Address:
+    address = Address(email_address=email_address)
+    user.addresses.append(address)
+    await session.commit()
+    return address
+
+async def list_addresses(session: AsyncSession, user_id: int) -> List[Address]:
+    result = await statements.execute(session, "address.list_by_user", user_id=user_id)
+    return list(result.scalars().all())
+
+# 대량 입력, ORM 객체를 만들지 않고 Core insert를 chunk 단위 executemany로 실행
+# users: [{"id": int | None, "name": str, "fullname": str | None, "addresses": [str, ...]}, ...]
+# upsert=True면 같은 id가 있을 때 name/fullname을 갱신하고 주소는 전달된 값으로 교체
+async def bulk_upsert_users(
+    session: AsyncSession,
+    users: Sequence[Dict[str, Any]],
+    chunk_size: int,
+    upsert: bool = False,
+) -> Dict[str, int]:
+    user_table = User.__table__
+    address_table = Address.__table__
+
+    insert_users = sqlite_insert(user_table)
+    if upsert:
+        insert_users = insert_users.on_conflict_do_update(
+            index_elements=[user_table.c.id],
+            set_={
+                "name": insert_users.excluded.name,
+                "fullname": insert_users.excluded.fullname,
+                # on_conflict_do_update는 컬럼의 onupdate를 적용하지 않으므로 직접 지정
+                "updated_at": insert_users.excluded.updated_at,
+            },
+        )
+    # RETURNING에 sort_by_parameter_order를 쓰면 SQLite에서는 insertmanyvalues가 한 행씩 실행되므로 사용하지 않음
+    # id가 있는 행: id를 이미 알고 있으므로 RETURNING 없이 executemany
+    # id가 없는 행: 한 INSERT 문 안에서 SQLite는 VALUES 순서대로 max(rowid)+1을 부여하므로 반환 id를 정렬하면 입력 순서와 같음
+    insert_new_users = insert(user_table).returning(user_table.c.id)
+
+    address_count = 0
+    chunks = 0
+    # 전체를 하나의 트랜잭션으로 처리, 중간에 실패하면 모두 롤백
+    async with session.begin():
+        for start in range(0, len(users), chunk_size):
+            chunk = users[start:start + chunk_size]
+            chunks += 1
+            known = [user for user in chunk if user.get("id") is not None]
+            new = [user for user in chunk if user.get("id") is None]
+            if known:
+                await session.execute(insert_users, [
+                    {"id": user["id"], "name": user["name"], "fullname": user.get("fullname")}
+                    for user in known
+                ])
+            new_ids: List[int] = []
+            if new:
+                result = await session.execute(insert_new_users, [
+                    {"name": user["name"], "fullname": user.get("fullname")} for user in new
+                ])
+                new_ids = sorted(result.scalars().all())
+            ids = [user["id"] for user in known] + new_ids
+            chunk = known + new
+
+            if upsert and known:
+                await session.execute(
+                    delete(address_table).where(address_table.c.user_id.in_(ids[:len(known)]))
+                )
+            address_rows = [
+                {"user_id": user_id, "email_address": email}
+                for user_id, user in zip(ids, chunk)
+                for email in user.get("addresses", ())
+            ]
+            if address_rows:
+                await session.execute(insert(address_table), address_rows)
+                address_count += len(address_rows)
+
+    return {"users": len(users), "addresses": address_count, "chunks": chunks}
+
+# test_data_v2 형태의 사용자를 bulk_upsert_users 입력으로 변환
+# name 컬럼은 String(30)이므로 앞 30자만 사용하고 원문은 fullname에 보관
+def users_from_dataset(dataset_users: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": user["id"],
+            "name": user["name"][:30],
+            "fullname": user["name"],
+            "addresses": [user["email"]],
+        }
+        for user in dataset_users
+    ]
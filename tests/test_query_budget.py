@@ -0,0 +1,132 @@
+# 라우트별 쿼리 수 상한(db.query_counter.query_budget) 회귀 테스트
+# in-memory aiosqlite DB에 사용자/주소를 넣고 query_budget_mode=raise로 호출, 상한을 넘으면 QueryBudgetExceeded로 실패
+# 실행: pip install pytest httpx && python -m pytest tests
+import asyncio
+
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+
+from apps.api.v1.dependencies import SessionDep
+from apps.config import Setting, create_app
+from apps.db.database import create_engine_from_settings, create_session_factory, create_tables
+from apps.db.query_counter import QueryBudgetExceeded, count_queries, install_query_counter, query_budget
+from apps.db.statements import statements
+from apps.service import user_service
+
+USERS = 10
+ADDRESSES_PER_USER = 3
+
+
+def make_settings() -> Setting:
+    return Setting(
+        database_url="sqlite+aiosqlite:///:memory:",
+        query_budget_mode="raise",
+        timing_enabled=False,
+        shared_datasets=False,
+    )
+
+
+@pytest.fixture
+def client():
+    app = create_app(make_settings())
+    with TestClient(app) as client:
+        for index in range(USERS):
+            response = client.post("/l_sql/users", json={
+                "name": f"user{index}",
+                "addresses": [{"email_address": f"user{index}-{n}@example.com"} for n in range(ADDRESSES_PER_USER)],
+            })
+            assert response.status_code == 201
+        yield client
+
+
+# 라우트: 상한을 넘으면 서버 예외(QueryBudgetExceeded)가 TestClient에서 그대로 발생
+@pytest.mark.parametrize("loader", ["selectin", "joined"])
+def test_list_users_within_budget(client, loader):
+    response = client.get("/l_sql/users", params={"limit": USERS, "loader": loader})
+    assert response.status_code == 200
+    users = response.json()
+    assert len(users) == USERS
+    assert all(len(user["addresses"]) == ADDRESSES_PER_USER for user in users)
+
+
+@pytest.mark.parametrize("loader", ["selectin", "joined"])
+def test_get_user_within_budget(client, loader):
+    response = client.get("/l_sql/users/1", params={"loader": loader})
+    assert response.status_code == 200
+    assert len(response.json()["addresses"]) == ADDRESSES_PER_USER
+
+
+def test_list_users_raise_loader_skips_addresses(client):
+    response = client.get("/l_sql/users", params={"limit": USERS, "loader": "raise"})
+    assert response.status_code == 200
+    assert all(user["addresses"] is None for user in response.json())
+
+
+def test_addresses_and_count_within_budget(client):
+    assert client.get("/l_sql/users/1/addresses").status_code == 200
+    assert client.get("/l_sql/users/count").json() == {"count": USERS}
+
+
+def test_budget_fails_on_n_plus_one(client):
+    # 사용자마다 주소를 따로 조회하는(N+1) 라우트는 상한(2)을 넘어서 실패해야 함
+    async def n_plus_one(session: SessionDep):
+        users = await user_service.list_users(session, USERS, loader="raise")
+        return [len(await user_service.list_addresses(session, user.id)) for user in users]
+
+    client.app.router.add_api_route("/_test/n_plus_one", n_plus_one, dependencies=[Depends(query_budget(2))])
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        client.get("/_test/n_plus_one")
+    assert exc_info.value.count == USERS + 1
+
+
+# 서비스 함수: 로딩 방식별 정확한 쿼리 수(사용자 수와 무관)
+async def _with_session(callback):
+    engine = create_engine_from_settings(make_settings())
+    install_query_counter(engine)
+    statements.install(engine)
+    await create_tables(engine)
+    try:
+        async with create_session_factory(engine)() as session:
+            for index in range(USERS):
+                await user_service.create_user(
+                    session, f"user{index}", None,
+                    [f"user{index}-{n}@example.com" for n in range(ADDRESSES_PER_USER)],
+                )
+        async with create_session_factory(engine)() as session:
+            return await callback(session)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("loader, expected", [("selectin", 2), ("joined", 1), ("raise", 1)])
+def test_list_users_query_count(loader, expected):
+    async def callback(session):
+        with count_queries() as counter:
+            users = await user_service.list_users(session, USERS, loader=loader)
+        return len(users), counter.count
+
+    assert asyncio.run(_with_session(callback)) == (USERS, expected)
+
+
+@pytest.mark.parametrize("loader, expected", [("selectin", 2), ("joined", 1)])
+def test_get_user_query_count(loader, expected):
+    async def callback(session):
+        with count_queries() as counter:
+            user = await user_service.get_user(session, 1, loader)
+        return len(user.addresses), counter.count
+
+    assert asyncio.run(_with_session(callback)) == (ADDRESSES_PER_USER, expected)
+
+
+def test_raise_loader_rejects_lazy_access():
+    # raise 방식으로 조회한 사용자의 addresses 접근은 쿼리 대신 예외
+    async def callback(session):
+        user = await user_service.get_user(session, 1, "raise")
+        with count_queries() as counter:
+            with pytest.raises(InvalidRequestError):
+                user.addresses
+        return counter.count
+
+    assert asyncio.run(_with_session(callback)) == 0